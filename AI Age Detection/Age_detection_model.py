@@ -1,40 +1,121 @@
- import cv2
- import numpy as np
- # Load models
- age_proto = 'age_deploy.prototxt'
- age_model = 'age_net.caffemodel'
- face_proto = 'deploy.prototxt'
- face_model = 'res10_300x300_ssd_iter_140000.caffemodel'
- AGE_LIST = ['(0-2)', '(4-6)', '(8-12)', '(15-20)',
+import contextlib
+import logging
+import sys
+import time
+import cv2
+import numpy as np
+from age_tracking import AgeTrackCache
+from dnn_backend import configure_nets
+# Load models
+age_proto = 'age_deploy.prototxt'
+age_model = 'age_net.caffemodel'
+face_proto = 'deploy.prototxt'
+face_model = 'res10_300x300_ssd_iter_140000.caffemodel'
+AGE_LIST = ['(0-2)', '(4-6)', '(8-12)', '(15-20)',
             '(25-32)', '(38-43)', '(48-53)', '(60-100)']
- age_net = cv2.dnn.readNetFromCaffe(age_proto, age_model)
- face_net = cv2.dnn.readNetFromCaffe(face_proto, face_model)
- cap = cv2.VideoCapture(0)
- while True:
-    ret, frame = cap.read()
-    if not ret:
-        break
+AGE_MEAN = (78.426, 87.768, 114.895)
+age_net = cv2.dnn.readNetFromCaffe(age_proto, age_model)
+face_net = cv2.dnn.readNetFromCaffe(face_proto, face_model)
+
+# "auto" benchmarks the available CPU backends/targets and thread counts at
+# startup; or set e.g. DNN_BACKEND = "openvino", DNN_TARGET = "cpu".
+DNN_BACKEND = "auto"
+DNN_TARGET = "cpu"
+DNN_THREADS = None
+logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+configure_nets([("face_net", face_net, (1, 3, 300, 300)),
+                ("age_net", age_net, (1, 3, 227, 227))],
+               backend=DNN_BACKEND, target=DNN_TARGET, threads=DNN_THREADS)
+
+
+def no_stage(name):
+    return contextlib.nullcontext()
+
+
+def detect_faces(frame, conf_threshold=0.6):
+    """Return an (N, 4) int array of x1, y1, x2, y2 boxes clamped to the frame."""
     h, w = frame.shape[:2]
     blob = cv2.dnn.blobFromImage(frame, 1.0, (300, 300), [104, 117, 123], False, False)
     face_net.setInput(blob)
-    detections = face_net.forward()
-    for i in range(detections.shape[2]):
-        confidence = detections[0, 0, i, 2]
-        if confidence > 0.6:
-            box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
-            (x1, y1, x2, y2) = box.astype("int")
-            face = frame[y1:y2, x1:x2]
-            face_blob = cv2.dnn.blobFromImage(face, 1.0, (227, 227),
-            age_net.setInput(face_blob)
-            age_preds = age_net.forward()
-                                              (78.426, 87.768, 114.895), swapRB=False)
-            age = AGE_LIST[age_preds[0].argmax()]
-            label = f'Age: {age}'
+    detections = face_net.forward()[0, 0]
+    detections = detections[detections[:, 2] > conf_threshold]
+    boxes = (detections[:, 3:7] * np.array([w, h, w, h])).astype(int)
+    # The SSD can return boxes partly outside the frame, which used to give
+    # empty crops and crash blobFromImage.
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+    keep = (boxes[:, 2] - boxes[:, 0] > 1) & (boxes[:, 3] - boxes[:, 1] > 1)
+    return boxes[keep]
+
+
+def predict_ages(frame, boxes):
+    """Run the age net once on all face crops; return (N, len(AGE_LIST)) probabilities."""
+    if len(boxes) == 0:
+        return np.zeros((0, len(AGE_LIST)), dtype=np.float32)
+    faces = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes]
+    face_blob = cv2.dnn.blobFromImages(faces, 1.0, (227, 227), AGE_MEAN, swapRB=False)
+    age_net.setInput(face_blob)
+    return age_net.forward().reshape(len(boxes), -1)
+
+
+# Re-run the age net per face only every 15 frames or when the crop changes,
+# and average the last 10 estimates per face.
+age_cache = AgeTrackCache(predict_ages, refresh_every=15, window=10)
+
+
+def process_frame(frame, stage=no_stage):
+    with stage("face_detect"):
+        boxes = detect_faces(frame)
+    with stage("age_predict"):
+        tracked = age_cache.update(frame, boxes)
+    with stage("render"):
+        for track_id, (x1, y1, x2, y2), probs in tracked:
+            age = AGE_LIST[probs.argmax()]
+            label = f'#{track_id} Age: {age}'
             cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
             cv2.putText(frame, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX,
                         0.8, (255, 255, 255), 2)
-    cv2.imshow("Age Detection", frame)
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
- cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+    return frame
+
+
+def benchmark(face_counts=(1, 2, 4, 8, 16), repeats=20):
+    """Compare per-face forward passes with one batched pass, by face count."""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+    print(f"{'faces':>6} {'per-face fps':>13} {'batched fps':>12} {'speedup':>8}")
+    for n in face_counts:
+        x1 = rng.integers(0, 1080, n)
+        y1 = rng.integers(0, 520, n)
+        boxes = np.stack([x1, y1, x1 + 200, y1 + 200], axis=1)
+
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            for x1_, y1_, x2_, y2_ in boxes:
+                blob = cv2.dnn.blobFromImage(frame[y1_:y2_, x1_:x2_], 1.0, (227, 227), AGE_MEAN, swapRB=False)
+                age_net.setInput(blob)
+                age_net.forward()
+        per_face = repeats / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            predict_ages(frame, boxes)
+        batched = repeats / (time.perf_counter() - t0)
+        print(f"{n:>6} {per_face:>13.1f} {batched:>12.1f} {batched / per_face:>7.2f}x")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+        sys.exit()
+    cap = cv2.VideoCapture(0)
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame = process_frame(frame)
+        cv2.imshow("Age Detection", frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+    cap.release()
+    cv2.destroyAllWindows()
+    print(age_cache.stats())
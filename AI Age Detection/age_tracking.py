@@ -0,0 +1,132 @@
+"""Per-face tracking, age-estimate caching and temporal smoothing.
+
+A person's age bracket does not change from one frame to the next, yet the
+detector used to run the age net on every face in every frame, and the
+per-frame argmax flickered. AgeTrackCache:
+
+* matches face boxes to tracks by IoU, so each face keeps a stable ID;
+* runs the age net for a track only when it is new, when ``refresh_every``
+  frames have passed, or when its crop changed a lot (mean absolute
+  difference of a small grey thumbnail above ``change_threshold``);
+* averages each track's last ``window`` age probability vectors before
+  taking the argmax.
+
+``stats()`` reports how many age-net crops were actually run, compared with
+the number of faces seen.
+"""
+
+import collections
+
+import cv2
+import numpy as np
+
+THUMB = (16, 16)
+
+
+def _iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _thumb(frame, box):
+    x1, y1, x2, y2 = box
+    gray = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, THUMB, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+class AgeTrack:
+    def __init__(self, track_id, box, window):
+        self.id = track_id
+        self.box = box
+        self.probs = collections.deque(maxlen=window)
+        self.thumb = None
+        self.last_inference = None
+        self.missing = 0
+
+    @property
+    def smoothed(self):
+        return np.mean(self.probs, axis=0)
+
+
+class AgeTrackCache:
+    def __init__(self, predict_fn, refresh_every=15, change_threshold=20.0, window=10,
+                 iou_threshold=0.3, max_missing=10):
+        self.predict_fn = predict_fn
+        self.refresh_every = refresh_every
+        self.change_threshold = change_threshold
+        self.window = window
+        self.iou_threshold = iou_threshold
+        self.max_missing = max_missing
+        self.tracks = []
+        self._next_id = 1
+        self._frame = 0
+        self.faces_seen = 0
+        self.age_net_crops = 0
+
+    def _match(self, boxes):
+        """Greedy IoU assignment of boxes to existing tracks."""
+        pairs = sorted(((_iou(t.box, b), ti, bi) for ti, t in enumerate(self.tracks)
+                        for bi, b in enumerate(boxes)), reverse=True)
+        track_for_box = {}
+        used = set()
+        for iou, ti, bi in pairs:
+            if iou < self.iou_threshold:
+                break
+            if ti in used or bi in track_for_box:
+                continue
+            track_for_box[bi] = self.tracks[ti]
+            used.add(ti)
+        return track_for_box
+
+    def update(self, frame, boxes):
+        """Return a list of (track_id, box, smoothed_probs) for this frame's faces."""
+        boxes = [tuple(int(v) for v in b) for b in boxes]
+        track_for_box = self._match(boxes)
+
+        current = []
+        stale = []
+        for bi, box in enumerate(boxes):
+            track = track_for_box.get(bi)
+            if track is None:
+                track = AgeTrack(self._next_id, box, self.window)
+                self._next_id += 1
+                self.tracks.append(track)
+            track.box = box
+            track.missing = 0
+            thumb = _thumb(frame, box)
+
+            needs = track.last_inference is None or self._frame - track.last_inference >= self.refresh_every
+            if not needs and track.thumb is not None:
+                needs = float(np.abs(thumb - track.thumb).mean()) > self.change_threshold
+            if needs:
+                track.thumb = thumb
+                stale.append(track)
+            current.append(track)
+
+        if stale:
+            probs = self.predict_fn(frame, np.array([t.box for t in stale]))
+            self.age_net_crops += len(stale)
+            for track, p in zip(stale, probs):
+                track.probs.append(p)
+                track.last_inference = self._frame
+
+        seen = {id(t) for t in current}
+        for track in self.tracks:
+            if id(track) not in seen:
+                track.missing += 1
+        self.tracks = [t for t in self.tracks if t.missing <= self.max_missing]
+
+        self.faces_seen += len(boxes)
+        self._frame += 1
+        return [(t.id, t.box, t.smoothed) for t in current]
+
+    def stats(self):
+        return {
+            "frames": self._frame,
+            "faces_seen": self.faces_seen,
+            "age_net_crops": self.age_net_crops,
+            "reduction": self.faces_seen / self.age_net_crops if self.age_net_crops else 0.0,
+        }
@@ -0,0 +1,155 @@
+"""DNN backend/target selection and thread tuning for the Caffe models.
+
+``readNetFromCaffe`` networks run on OpenCV's default backend with the
+default thread count. ``configure_nets`` can:
+
+* apply an explicit backend/target pair (``opencv``, ``openvino``, ``cuda``
+  with ``cpu``, ``cpu_fp16``, ``opencl``, ``opencl_fp16``, ``cuda``,
+  ``cuda_fp16``), falling back to OpenCV/CPU when it is unavailable or fails;
+* or, with ``backend="auto"``, run a short startup micro-benchmark over the
+  available CPU configurations and thread counts (unless ``threads`` is
+  given) and keep the fastest.
+
+Every choice is logged through the ``dnn_backend`` logger.
+"""
+
+import logging
+import os
+import time
+
+import cv2
+import numpy as np
+
+log = logging.getLogger("dnn_backend")
+
+BACKENDS = {
+    "opencv": cv2.dnn.DNN_BACKEND_OPENCV,
+    "openvino": getattr(cv2.dnn, "DNN_BACKEND_INFERENCE_ENGINE", None),
+    "cuda": getattr(cv2.dnn, "DNN_BACKEND_CUDA", None),
+}
+TARGETS = {
+    "cpu": cv2.dnn.DNN_TARGET_CPU,
+    "cpu_fp16": getattr(cv2.dnn, "DNN_TARGET_CPU_FP16", None),
+    "opencl": getattr(cv2.dnn, "DNN_TARGET_OPENCL", None),
+    "opencl_fp16": getattr(cv2.dnn, "DNN_TARGET_OPENCL_FP16", None),
+    "cuda": getattr(cv2.dnn, "DNN_TARGET_CUDA", None),
+    "cuda_fp16": getattr(cv2.dnn, "DNN_TARGET_CUDA_FP16", None),
+}
+CPU_TARGETS = ("cpu", "cpu_fp16")
+
+
+def available_pairs(cpu_only=True):
+    """Return (backend_name, target_name) pairs this OpenCV build reports."""
+    pairs = []
+    for b_name, backend in BACKENDS.items():
+        if backend is None:
+            continue
+        try:
+            targets = cv2.dnn.getAvailableTargets(backend)
+        except cv2.error:
+            continue
+        for t_name, target in TARGETS.items():
+            if target is None or target not in targets:
+                continue
+            if cpu_only and t_name not in CPU_TARGETS:
+                continue
+            pairs.append((b_name, t_name))
+    return pairs
+
+
+def _apply(net, backend, target):
+    net.setPreferableBackend(BACKENDS[backend])
+    net.setPreferableTarget(TARGETS[target])
+
+
+def _time_forward(net, blob, repeats):
+    net.setInput(blob)
+    net.forward()  # warm-up; also where an unsupported configuration fails
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        net.setInput(blob)
+        net.forward()
+    return (time.perf_counter() - t0) / repeats
+
+
+def apply_config(net, backend="opencv", target="cpu", probe_blob=None):
+    """Apply a backend/target pair, falling back to OpenCV/CPU if it does not work."""
+    if BACKENDS.get(backend) is None or TARGETS.get(target) is None:
+        log.warning("%s/%s not available in this OpenCV build; using opencv/cpu", backend, target)
+        backend, target = "opencv", "cpu"
+    _apply(net, backend, target)
+    if probe_blob is not None and (backend, target) != ("opencv", "cpu"):
+        try:
+            net.setInput(probe_blob)
+            net.forward()
+        except cv2.error as e:
+            log.warning("%s/%s failed (%s); using opencv/cpu", backend, target, str(e).splitlines()[0])
+            backend, target = "opencv", "cpu"
+            _apply(net, backend, target)
+    return backend, target
+
+
+def autotune(nets, repeats=10, thread_options=None):
+    """Pick the thread count and, per net, the fastest CPU backend/target.
+
+    ``nets`` is a list of (name, net, input_shape) where input_shape is the
+    NCHW shape of a typical input blob. The thread count is chosen on the
+    first net, because it is global to OpenCV.
+    Returns {"threads": n, name: (backend, target, ms), ...}.
+    """
+    cpus = os.cpu_count() or 1
+    if thread_options is None:
+        thread_options = sorted({1, max(1, cpus // 2), cpus})
+
+    blobs = {name: np.random.default_rng(0).standard_normal(shape).astype(np.float32)
+             for name, _, shape in nets}
+
+    first_name, first_net, _ = nets[0]
+    _apply(first_net, "opencv", "cpu")
+    best_threads, best_t = None, float("inf")
+    for n in thread_options:
+        cv2.setNumThreads(n)
+        t = _time_forward(first_net, blobs[first_name], repeats)
+        log.info("threads=%d: %s %.2f ms", n, first_name, t * 1000)
+        if t < best_t:
+            best_threads, best_t = n, t
+    cv2.setNumThreads(best_threads)
+    choice = {"threads": best_threads}
+    log.info("selected threads=%d", best_threads)
+
+    pairs = available_pairs(cpu_only=True)
+    for name, net, _ in nets:
+        best = ("opencv", "cpu", float("inf"))
+        for backend, target in pairs:
+            try:
+                _apply(net, backend, target)
+                t = _time_forward(net, blobs[name], repeats)
+            except cv2.error as e:
+                log.info("%s %s/%s: unavailable (%s)", name, backend, target, str(e).splitlines()[0])
+                continue
+            log.info("%s %s/%s: %.2f ms", name, backend, target, t * 1000)
+            if t < best[2]:
+                best = (backend, target, t)
+        _apply(net, best[0], best[1])
+        choice[name] = (best[0], best[1], round(best[2] * 1000, 3))
+        log.info("selected %s: %s/%s (%.2f ms)", name, best[0], best[1], best[2] * 1000)
+    return choice
+
+
+def configure_nets(nets, backend="auto", target="cpu", threads=None, repeats=10):
+    """Configure a list of (name, net, input_shape) for inference.
+
+    ``backend="auto"`` runs ``autotune``. Otherwise the given backend/target
+    is applied to every net with automatic fallback. ``threads`` (if set)
+    fixes the thread count in both cases; autotune then only picks backends.
+    """
+    if backend == "auto":
+        return autotune(nets, repeats=repeats, thread_options=[threads] if threads else None)
+    if threads:
+        cv2.setNumThreads(threads)
+    choice = {"threads": cv2.getNumThreads()}
+    for name, net, shape in nets:
+        probe = np.zeros(shape, dtype=np.float32)
+        choice[name] = apply_config(net, backend, target, probe)
+        log.info("%s: %s/%s", name, *choice[name])
+    return choice
@@ -1,21 +1,41 @@
+import contextlib
 import cv2
-face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    print("Camera not accessible.")
-    exit()
-print("Press 'q' to quit.")
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        print("Failed to grab frame.")
-        break
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    faces = face_cascade.detectMultiScale(gray, 1.3, 5)
-    for (x, y, w, h) in faces:
-        cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
-    cv2.imshow('Face Detection', frame)
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
-cap.release()
-cv2.destroyAllWindows()
+from face_detectors import FaceTracker, create_detector
+
+BACKEND = "haar"     # "haar", "ssd" or "yunet" (see face_detectors.py)
+DETECT_EVERY = 1     # run the detector every N frames, track in between
+TRACKER = "iou"      # "iou", "kcf", "csrt" or "mil"
+PYRAMID = False      # downscaled full scans + ROI-only re-detection in between
+face_tracker = FaceTracker(create_detector(BACKEND, pyramid=PYRAMID), every_n=DETECT_EVERY, tracker=TRACKER)
+
+
+def no_stage(name):
+    return contextlib.nullcontext()
+
+
+def process_frame(frame, stage=no_stage):
+    with stage("detect"):
+        faces = face_tracker.update(frame)
+    with stage("render"):
+        for (x, y, w, h) in faces:
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
+    return frame
+
+
+if __name__ == "__main__":
+    cap = cv2.VideoCapture(0)
+    if not cap.isOpened():
+        print("Camera not accessible.")
+        exit()
+    print("Press 'q' to quit.")
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            print("Failed to grab frame.")
+            break
+        frame = process_frame(frame)
+        cv2.imshow('Face Detection', frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+    cap.release()
+    cv2.destroyAllWindows()
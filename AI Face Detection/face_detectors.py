@@ -0,0 +1,355 @@
+"""Selectable face detector backends plus detect-every-N tracking.
+
+Backends (all return an (N, 4) int array of x, y, w, h like detectMultiScale):
+
+    haar    the original Haar cascade, detectMultiScale(gray, 1.3, 5)
+    ssd     OpenCV's res10 300x300 SSD (deploy.prototxt + caffemodel)
+    yunet   OpenCV's YuNet ONNX model via cv2.FaceDetectorYN
+
+FaceTracker runs a backend every ``every_n`` frames. Between detections it
+either updates per-face OpenCV trackers (``kcf``/``csrt``/``mil``), or, in
+``iou`` mode, moves each box at a constant velocity estimated from its last
+two matched detections. When new detections come in, they are
+matched to the previous boxes by IoU and smoothed, which removes the
+frame-to-frame jitter of raw cascade output.
+
+PyramidROIDetector wraps any backend. Full scans run on a downscaled copy
+of the frame and the boxes are mapped back to full resolution. Between
+full scans, only regions around the previous boxes (expanded by a margin) are
+searched, each resized so the face is about ``roi_face_size`` pixels. It
+goes back to a full scan every ``full_every`` frames, or as soon as a
+face is lost.
+
+``python face_detectors.py clip.mp4`` reports FPS and recall (against
+per-frame detections of the reference backend) for each configuration.
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+SSD_PROTO = "deploy.prototxt"
+SSD_MODEL = "res10_300x300_ssd_iter_140000.caffemodel"
+YUNET_MODEL = "face_detection_yunet_2023mar.onnx"
+
+EMPTY = np.zeros((0, 4), dtype=np.int32)
+
+
+def clip_boxes(boxes, width, height, min_size=2):
+    """Clamp (N, 4) x, y, w, h boxes to the frame and drop degenerate ones.
+
+    The SSD and YuNet can return boxes partly outside the frame, which crash
+    OpenCV tracker ``init`` (and give empty crops).
+    """
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    x1 = boxes[:, 0].clip(0, width)
+    y1 = boxes[:, 1].clip(0, height)
+    x2 = (boxes[:, 0] + boxes[:, 2]).clip(0, width)
+    y2 = (boxes[:, 1] + boxes[:, 3]).clip(0, height)
+    out = np.stack([x1, y1, x2 - x1, y2 - y1], axis=1).astype(np.int32)
+    return out[(out[:, 2] >= min_size) & (out[:, 3] >= min_size)]
+
+
+class HaarDetector:
+    def __init__(self, scale_factor=1.3, min_neighbors=5):
+        self.cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+
+    def detect(self, frame):
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = self.cascade.detectMultiScale(gray, self.scale_factor, self.min_neighbors)
+        return np.asarray(faces, dtype=np.int32).reshape(-1, 4)
+
+
+class SSDDetector:
+    def __init__(self, proto=SSD_PROTO, model=SSD_MODEL, conf_threshold=0.6):
+        self.net = cv2.dnn.readNetFromCaffe(proto, model)
+        self.conf_threshold = conf_threshold
+
+    def detect(self, frame):
+        h, w = frame.shape[:2]
+        blob = cv2.dnn.blobFromImage(frame, 1.0, (300, 300), [104, 117, 123], False, False)
+        self.net.setInput(blob)
+        detections = self.net.forward()[0, 0]
+        detections = detections[detections[:, 2] > self.conf_threshold]
+        boxes = detections[:, 3:7] * np.array([w, h, w, h])
+        boxes[:, 2:] -= boxes[:, :2]
+        return clip_boxes(boxes, w, h)
+
+
+class YuNetDetector:
+    def __init__(self, model=YUNET_MODEL, conf_threshold=0.8):
+        self.net = cv2.FaceDetectorYN.create(model, "", (320, 320), conf_threshold)
+        self._size = None
+
+    def detect(self, frame):
+        h, w = frame.shape[:2]
+        if self._size != (w, h):
+            self.net.setInputSize((w, h))
+            self._size = (w, h)
+        _, faces = self.net.detect(frame)
+        if faces is None:
+            return EMPTY
+        return clip_boxes(faces[:, :4], w, h)
+
+
+BACKENDS = {"haar": HaarDetector, "ssd": SSDDetector, "yunet": YuNetDetector}
+
+
+def create_detector(name, pyramid=False, **kwargs):
+    detector = BACKENDS[name](**kwargs)
+    return PyramidROIDetector(detector) if pyramid else detector
+
+
+def iou_xywh(a, b):
+    """Pairwise IoU between (N, 4) and (M, 4) x, y, w, h arrays."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)))
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 0] + a[:, None, 2], b[None, :, 0] + b[None, :, 2])
+    y2 = np.minimum(a[:, None, 1] + a[:, None, 3], b[None, :, 1] + b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    union = (a[:, 2] * a[:, 3])[:, None] + (b[:, 2] * b[:, 3])[None, :] - inter
+    return inter / np.maximum(union, 1e-9)
+
+
+def _dedupe(boxes, iou_threshold=0.5):
+    """Drop boxes that overlap an earlier box (ROIs of nearby faces overlap)."""
+    keep = []
+    for box in boxes:
+        if not keep or iou_xywh(box[None], np.array(keep)).max() < iou_threshold:
+            keep.append(box)
+    return np.asarray(keep, dtype=np.int32).reshape(-1, 4)
+
+
+class PyramidROIDetector:
+    def __init__(self, base, scale=0.25, full_every=15, roi_margin=0.6, roi_face_size=80):
+        self.base = base
+        self.scale = scale
+        self.full_every = max(1, int(full_every))
+        self.roi_margin = roi_margin
+        self.roi_face_size = roi_face_size
+        self.boxes = EMPTY
+        self._since_full = None
+        self.full_scans = 0
+
+    def _detect_scaled(self, image, scale):
+        if scale == 1.0:
+            return self.base.detect(image).astype(np.float64)
+        small = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return self.base.detect(small).astype(np.float64) / scale
+
+    def _full_scan(self, frame):
+        self.full_scans += 1
+        self._since_full = 0
+        return self._detect_scaled(frame, self.scale).round().astype(np.int32).reshape(-1, 4)
+
+    def _roi_scan(self, frame):
+        h, w = frame.shape[:2]
+        found = []
+        for x, y, bw, bh in self.boxes:
+            mx, my = int(bw * self.roi_margin), int(bh * self.roi_margin)
+            x1, y1 = max(0, x - mx), max(0, y - my)
+            x2, y2 = min(w, x + bw + mx), min(h, y + bh + my)
+            if x2 - x1 < 8 or y2 - y1 < 8:
+                return None
+            roi_scale = min(1.0, self.roi_face_size / max(bw, 1))
+            boxes = self._detect_scaled(frame[y1:y2, x1:x2], roi_scale)
+            if len(boxes) == 0:
+                return None  # face lost: fall back to a full scan
+            boxes[:, :2] += (x1, y1)
+            found.extend(boxes.round().astype(np.int32))
+        return _dedupe(found)
+
+    def detect(self, frame):
+        boxes = None
+        if self._since_full is not None and self._since_full + 1 < self.full_every and len(self.boxes):
+            boxes = self._roi_scan(frame)
+            if boxes is not None:
+                self._since_full += 1
+        if boxes is None:
+            boxes = self._full_scan(frame)
+        self.boxes = boxes
+        return boxes
+
+
+def _create_cv_tracker(kind):
+    # The tracker factories moved between cv2, cv2.legacy and *_create /
+    # .create across OpenCV versions; try them all.
+    name = {"kcf": "TrackerKCF", "csrt": "TrackerCSRT", "mil": "TrackerMIL"}[kind]
+    for ns in (cv2, getattr(cv2, "legacy", None)):
+        if ns is None:
+            continue
+        factory = getattr(ns, f"{name}_create", None) or getattr(getattr(ns, name, None), "create", None)
+        if factory is not None:
+            return factory()
+    raise RuntimeError(f"OpenCV tracker {name} is not available (install opencv-contrib-python)")
+
+
+class FaceTracker:
+    def __init__(self, detector, every_n=1, tracker="iou", smoothing=0.5, iou_threshold=0.3):
+        self.detector = detector
+        self.every_n = max(1, int(every_n))
+        self.tracker = tracker
+        self.smoothing = smoothing
+        self.iou_threshold = iou_threshold
+        self.boxes = EMPTY
+        self._cv_trackers = []
+        # iou mode: last raw detections, their extrapolated positions and
+        # per-frame velocities (rows aligned).
+        self._detected = np.zeros((0, 4))
+        self._pos = np.zeros((0, 4))
+        self._vel = np.zeros((0, 4))
+        self._frame = 0
+        self.detector_calls = 0
+
+    def _smooth(self, detections):
+        """Blend new detections toward the IoU-matched previous boxes."""
+        if len(self.boxes) == 0 or len(detections) == 0 or self.smoothing <= 0:
+            return detections
+        iou = iou_xywh(detections, self.boxes)
+        best = iou.argmax(axis=1)
+        out = detections.astype(np.float64)
+        for i, j in enumerate(best):
+            if iou[i, j] >= self.iou_threshold:
+                out[i] = self.smoothing * self.boxes[j] + (1 - self.smoothing) * out[i]
+        return out.round().astype(np.int32)
+
+    def _start_motion(self, detections, smoothed):
+        """Estimate per-frame velocities from the previous detections (iou mode)."""
+        detections = detections.astype(np.float64)
+        vel = np.zeros_like(detections)
+        if len(detections) and len(self._pos):
+            # Match each detection to the nearest extrapolated face (where the
+            # previous faces should be now) within one face size. Centre
+            # distance, unlike IoU, still matches fast faces that moved more
+            # than their own overlap over ``every_n`` frames.
+            centres = detections[:, :2] + detections[:, 2:] / 2
+            predicted = self._pos[:, :2] + self._pos[:, 2:] / 2
+            dist = np.linalg.norm(centres[:, None] - predicted[None], axis=2)
+            for i, j in enumerate(dist.argmin(axis=1)):
+                if dist[i, j] <= self._pos[j, 2:].max():
+                    vel[i] = (detections[i] - self._detected[j]) / self.every_n
+        self._detected = detections
+        self._pos = smoothed.astype(np.float64)
+        self._vel = vel
+
+    def update(self, frame):
+        """Return the face boxes (x, y, w, h) for the next frame."""
+        h, w = frame.shape[:2]
+        if self._frame % self.every_n == 0:
+            self.detector_calls += 1
+            detections = clip_boxes(self.detector.detect(frame), w, h)
+            smoothed = self._smooth(detections)
+            if self.tracker == "iou" and self.every_n > 1:
+                self._start_motion(detections, smoothed)
+            self.boxes = clip_boxes(smoothed, w, h)
+            if self.tracker != "iou":
+                self._cv_trackers = []
+                for box in self.boxes:
+                    t = _create_cv_tracker(self.tracker)
+                    t.init(frame, tuple(int(v) for v in box))
+                    self._cv_trackers.append(t)
+        elif self._cv_trackers:
+            boxes = []
+            alive = []
+            for t in self._cv_trackers:
+                ok, box = t.update(frame)
+                if ok:
+                    boxes.append(box)
+                    alive.append(t)
+            self._cv_trackers = alive
+            self.boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        elif self.tracker == "iou" and len(self._pos):
+            self._pos += self._vel
+            self.boxes = clip_boxes(self._pos.round(), w, h)
+        self._frame += 1
+        return self.boxes
+
+
+def recall(reference, predicted, iou_threshold=0.5):
+    """Fraction of reference boxes matched by a predicted box with IoU >= threshold."""
+    if len(reference) == 0:
+        return None
+    if len(predicted) == 0:
+        return 0.0
+    return float((iou_xywh(reference, predicted).max(axis=1) >= iou_threshold).mean())
+
+
+def evaluate(video, configs, reference="ssd", max_frames=None):
+    """Benchmark each (backend, every_n, tracker, pyramid) config on a recorded clip.
+
+    Recall is measured against per-frame detections of the ``reference``
+    backend, because recorded clips usually come without annotations.
+    """
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while max_frames is None or len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise IOError(f"No frames read from {video}")
+
+    ref_detector = create_detector(reference)
+    ref_boxes = [ref_detector.detect(f) for f in frames]
+
+    report = []
+    for backend, every_n, tracker, pyramid in configs:
+        ft = FaceTracker(create_detector(backend, pyramid=pyramid), every_n=every_n, tracker=tracker)
+        recalls = []
+        t0 = time.perf_counter()
+        for frame, ref in zip(frames, ref_boxes):
+            boxes = ft.update(frame)
+            r = recall(ref, boxes)
+            if r is not None:
+                recalls.append(r)
+        elapsed = time.perf_counter() - t0
+        report.append({
+            "backend": backend,
+            "every_n": every_n,
+            "tracker": tracker,
+            "pyramid": pyramid,
+            "fps": len(frames) / elapsed,
+            "recall": float(np.mean(recalls)) if recalls else float("nan"),
+            "detector_calls": ft.detector_calls,
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--backends", default="haar,ssd,yunet")
+    parser.add_argument("--every-n", default="1,5")
+    parser.add_argument("--trackers", default="iou,kcf")
+    parser.add_argument("--reference", default="ssd", choices=sorted(BACKENDS))
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--pyramid", action="store_true",
+                        help="also benchmark each backend wrapped in PyramidROIDetector")
+    args = parser.parse_args()
+
+    configs = []
+    for backend in args.backends.split(","):
+        for n in (int(v) for v in args.every_n.split(",")):
+            for tracker in (args.trackers.split(",") if n > 1 else ["iou"]):
+                configs.append((backend, n, tracker, False))
+        if args.pyramid:
+            configs.append((backend, 1, "iou", True))
+
+    print(f"{'backend':>8} {'every_n':>7} {'tracker':>7} {'pyramid':>7} {'fps':>8} {'recall':>7}")
+    for row in evaluate(args.video, configs, args.reference, args.max_frames):
+        print(f"{row['backend']:>8} {row['every_n']:>7} {row['tracker']:>7} {str(row['pyramid']):>7} "
+              f"{row['fps']:>8.1f} {row['recall']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
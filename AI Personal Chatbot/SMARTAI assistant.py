@@ -9,6 +9,124 @@ import wikipedia
 import random
 import pyjokes
 import string
+import threading
+import queue
+import time
+
+
+class TTSWorker(threading.Thread):
+    """Speaks queued text on its own thread so the Tk main loop never blocks.
+
+    The pyttsx3 engine is created and used only on this thread. ``cancel()``
+    interrupts the current utterance and drops everything queued before it,
+    so replies to an old query are never spoken after a new one arrives.
+    If the engine cannot be created, ``error`` holds the exception, the
+    thread exits, and ``say`` becomes a no-op.
+    """
+
+    def __init__(self, rate=180, voice_index=0):
+        super().__init__(name="tts", daemon=True)
+        self.queue = queue.Queue()
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._voice_index = voice_index
+        self.engine = None
+        self.voices = []
+        self._speaking = None
+        self.ready = threading.Event()
+        self.error = None
+
+    def run(self):
+        try:
+            self.engine = pyttsx3.init()
+            self.voices = self.engine.getProperty('voices')
+            self.engine.setProperty('voice', self.voices[self._voice_index].id)
+            self.engine.setProperty('rate', self._rate)
+            self.engine.connect('started-word', self._on_word)
+        except Exception as e:
+            self.error = e
+            self.voices = []
+            return
+        finally:
+            self.ready.set()
+
+        while True:
+            kind, generation, value = self.queue.get()
+            if kind == "quit":
+                break
+            if kind == "voice":
+                if value < len(self.voices):
+                    self.engine.setProperty('voice', self.voices[value].id)
+            elif kind == "rate":
+                self.engine.setProperty('rate', value)
+            elif kind == "call":
+                value()
+            elif kind == "say":
+                if generation != self.generation:
+                    continue  # stale: a newer query arrived before we got here
+                self._speaking = generation
+                self.engine.say(value)
+                self.engine.runAndWait()
+
+    def _on_word(self, name, location, length):
+        # Runs inside runAndWait; stop() here is the supported way to interrupt.
+        if self._speaking != self.generation:
+            self.engine.stop()
+
+    def say(self, text, wait=False):
+        if not self.is_alive():
+            return  # engine failed or stopped: nothing would drain the queue
+        self.queue.put(("say", self.generation, text))
+        if wait:
+            done = threading.Event()
+            self.queue.put(("call", None, done.set))
+            # Stop waiting if the worker dies mid-utterance.
+            while not done.wait(0.5):
+                if not self.is_alive():
+                    break
+
+    def cancel(self):
+        with self._lock:
+            self.generation += 1
+
+    def set_voice(self, index):
+        self.queue.put(("voice", None, index))
+
+    def set_rate(self, rate):
+        self.queue.put(("rate", None, rate))
+
+    def stop(self):
+        self.cancel()
+        self.queue.put(("quit", None, None))
+
+
+class LagMonitor:
+    """Measures Tk event-loop lag: how late a periodic after() callback fires."""
+
+    def __init__(self, root, interval_ms=50, window=200):
+        self.root = root
+        self.interval = interval_ms / 1000
+        self.samples = []
+        self.window = window
+        self._expected = None
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval
+        self.root.after(int(self.interval * 1000), self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.samples.append(max(0.0, now - self._expected))
+        del self.samples[:-self.window]
+        self._expected = now + self.interval
+        self.root.after(int(self.interval * 1000), self._tick)
+
+    def stats(self):
+        if not self.samples:
+            return 0.0, 0.0
+        return (sum(self.samples) / len(self.samples) * 1000, max(self.samples) * 1000)
+
 
 class AssistantGUI: 
     def __init__(self, root):
@@ -16,17 +134,27 @@ class AssistantGUI:
         self.root.title("AI Assistant")
         self.root.geometry("800x600")
         
-        # Initialize TTS engine
-        self.engine = pyttsx3.init()
-        self.voices = self.engine.getProperty('voices')
-        self.engine.setProperty('voice', self.voices[0].id)
-        self.engine.setProperty('rate', 180)
+        # Initialize TTS engine on its own worker thread
+        self.tts = TTSWorker(rate=180, voice_index=0)
+        self.tts.start()
+        if not self.tts.ready.wait(timeout=5):
+            print("Text-to-speech engine is still starting; voices may be missing.")
+        elif self.tts.error is not None or not self.tts.is_alive():
+            print(f"Text-to-speech unavailable ({self.tts.error}); replies will be text only.")
+        self.voices = self.tts.voices
+        self.main_thread = threading.current_thread()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Initialize speech recognizer
         self.recognizer = sr.Recognizer()
         self.chat_only_mode = True
         
         self.create_gui()
+
+        # Event-loop lag, shown in the Settings tab
+        self.lag_monitor = LagMonitor(self.root)
+        self.lag_monitor.start()
+        self.update_lag_label()
         
     def open_website(self, site):
         websites = {
@@ -146,13 +274,37 @@ class AssistantGUI:
                        value="Chat", command=self.change_mode).pack()
         ttk.Radiobutton(settings_frame, text="Voice Enabled", variable=self.mode_var, 
                        value="Voice", command=self.change_mode).pack()
+
+        # Blocking speech reproduces the old behaviour so UI lag can be compared
+        self.blocking_tts_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Blocking speech (old behaviour)",
+                        variable=self.blocking_tts_var).pack(pady=5)
+        self.lag_label = ttk.Label(settings_frame, text="UI lag: -")
+        self.lag_label.pack(pady=5)
     
-    def speak(self, text):
-        self.chat_history.insert(tk.END, f"Assistant: {text}\n")
+    def append_chat(self, text):
+        # Tk widgets may only be touched from the main thread.
+        if threading.current_thread() is not self.main_thread:
+            self.root.after(0, self.append_chat, text)
+            return
+        self.chat_history.insert(tk.END, text)
         self.chat_history.see(tk.END)
+
+    def speak(self, text):
+        self.append_chat(f"Assistant: {text}\n")
         if not self.chat_only_mode:
-            self.engine.say(text)
-            self.engine.runAndWait()
+            self.tts.say(text, wait=self.blocking_tts_var.get())
+
+    def update_lag_label(self):
+        mean_ms, max_ms = self.lag_monitor.stats()
+        self.lag_label.config(text=f"UI lag: mean {mean_ms:.1f} ms, max {max_ms:.1f} ms")
+        self.root.after(1000, self.update_lag_label)
+
+    def on_close(self):
+        mean_ms, max_ms = self.lag_monitor.stats()
+        print(f"UI event-loop lag: mean {mean_ms:.1f} ms, max {max_ms:.1f} ms")
+        self.tts.stop()
+        self.root.destroy()
     
     def listen(self):
         try:
@@ -172,8 +324,10 @@ class AssistantGUI:
         
         if not query:
             return
-        
-        self.chat_history.insert(tk.END, f"You: {query}\n")
+
+        # A new query makes any reply still being spoken or queued stale.
+        self.tts.cancel()
+        self.append_chat(f"You: {query}\n")
         
         # Handle different commands
         if 'whatsapp search' in query or 'whatsapp profile' in query:
@@ -279,10 +433,10 @@ class AssistantGUI:
     def change_voice(self, event=None):
         voice_index = 0 if self.voice_var.get() == "Male" else 1
         if voice_index < len(self.voices):
-            self.engine.setProperty('voice', self.voices[voice_index].id)
+            self.tts.set_voice(voice_index)
     
     def change_rate(self, event=None):
-        self.engine.setProperty('rate', self.rate_var.get())
+        self.tts.set_rate(self.rate_var.get())
     
     def change_mode(self):
         self.chat_only_mode = self.mode_var.get() == "Chat"
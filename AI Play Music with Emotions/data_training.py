@@ -1,68 +1,35 @@
-import os  
 import numpy as np 
-import cv2 
-from tensorflow.keras.utils import to_categorical
 
 from keras.layers import Input, Dense 
 from keras.models import Model
- 
-is_init = False
-size = -1
 
-label = []
-dictionary = {}
-c = 0
+from dataset import build_datasets
+from features import save_layout
 
-for i in os.listdir():
-	if i.split(".")[-1] == "npy" and not(i.split(".")[0] == "labels"):  
-		if not(is_init):
-			is_init = True 
-			X = np.load(i)
-			size = X.shape[0]
-			y = np.array([i.split('.')[0]]*size).reshape(-1,1)
-		else:
-			X = np.concatenate((X, np.load(i)))
-			y = np.concatenate((y, np.array([i.split('.')[0]]*size).reshape(-1,1)))
+# Landmark subset to train on (see features.LAYOUTS); saved next to labels.npy
+# so inference extracts the same layout. None trains on the layout the
+# recordings were made with; name a subset only to cut "full" recordings down.
+LAYOUT = None
 
-		label.append(i.split('.')[0])
-		dictionary[i.split('.')[0]] = c  
-		c = c+1
+data, train_ds, val_ds = build_datasets("recordings", val_split=0.2, batch_size=64, layout=LAYOUT)
+print(f"{len(data)} samples, {data.num_classes} classes: {data.labels}, "
+      f"layout {data.layout['name']!r} ({data.feature_size} features)")
 
 
-for i in range(y.shape[0]):
-	y[i, 0] = dictionary[y[i, 0]]
-y = np.array(y, dtype="int32")
-
-###  hello = 0 nope = 1 ---> [1,0] ... [0,1]
-
-y = to_categorical(y)
-
-X_new = X.copy()
-y_new = y.copy()
-counter = 0 
-
-cnt = np.arange(X.shape[0])
-np.random.shuffle(cnt)
-
-for i in cnt: 
-	X_new[counter] = X[i]
-	y_new[counter] = y[i]
-	counter = counter + 1
-
-
-ip = Input(shape=(X.shape[1]))
+ip = Input(shape=(data.feature_size,))
 
 m = Dense(512, activation="relu")(ip)
 m = Dense(256, activation="relu")(m)
 
-op = Dense(y.shape[1], activation="softmax")(m) 
+op = Dense(data.num_classes, activation="softmax")(m) 
 
 model = Model(inputs=ip, outputs=op)
 
 model.compile(optimizer='rmsprop', loss="categorical_crossentropy", metrics=['acc'])
 
-model.fit(X, y, epochs=50)
+model.fit(train_ds, validation_data=val_ds, epochs=50)
 
 
 model.save("model.h5")
-np.save("labels.npy", np.array(label))
+np.save("labels.npy", np.array(data.labels))
+save_layout(data.layout)
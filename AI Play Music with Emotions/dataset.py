@@ -0,0 +1,152 @@
+"""Training dataset builder for the emotion classifier.
+
+The old loader grew ``X`` with repeated ``np.concatenate`` (quadratic
+copying), assumed every class had as many rows as the first file, relabelled
+``y`` in a Python loop and built shuffled copies that were never used. Here:
+
+* each shard listed in ``recordings/index.json`` (see recording.py) is
+  memory-mapped, not loaded. Without an index, legacy ``<label>.npy`` files
+  (which the old collector wrote next to the scripts) are used instead;
+* labels come from the per-file row counts with one ``np.repeat``;
+* shuffling and the validation split permute an index array, never the
+  data;
+* ``tf.data`` gathers each batch from the memory maps on demand, so only
+  one batch of features is in RAM at a time.
+"""
+
+import glob
+import os
+
+import numpy as np
+
+import recording
+from features import get_layout, layout_columns
+
+RESERVED = {"labels"}
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _legacy_sources(directory):
+	paths = sorted(p for p in glob.glob(os.path.join(directory, "*.npy"))
+				   if os.path.splitext(os.path.basename(p))[0] not in RESERVED)
+	return {os.path.splitext(os.path.basename(p))[0]: [p] for p in paths}
+
+
+def find_sources(directory):
+	"""Return ({label: [npy paths]}, layout name) from a recordings index or legacy <label>.npy files.
+
+	Without an index, legacy files are looked for in ``directory``, then in
+	the working directory and the script directory, where the old collector
+	wrote them.
+	"""
+	if os.path.exists(os.path.join(directory, recording.INDEX)):
+		layout = recording.load_index(directory).get("layout") or "full"
+		return recording.shard_paths(directory), layout
+	for d in dict.fromkeys([directory, os.getcwd(), SCRIPT_DIR]):
+		sources = _legacy_sources(d)
+		if sources:
+			return sources, "full"
+	return {}, "full"
+
+
+class EmotionDataset:
+	def __init__(self, directory="recordings", seed=0, layout=None):
+		sources, source_layout = find_sources(directory)
+		sources = {label: paths for label, paths in sources.items() if paths}
+		if not sources:
+			raise FileNotFoundError(f"No {recording.INDEX} in {directory!r} and no legacy <label>.npy files "
+									f"in it, the working directory or {SCRIPT_DIR!r}")
+
+		self.labels = sorted(sources)
+		self.arrays = []
+		file_class = []
+		for c, label in enumerate(self.labels):
+			for p in sources[label]:
+				self.arrays.append(np.load(p, mmap_mode="r"))
+				file_class.append(c)
+		widths = {a.shape[1] for a in self.arrays}
+		if len(widths) != 1:
+			raise ValueError(f"Feature files have different widths: {sorted(widths)}")
+		self.feature_size = widths.pop()
+
+		# Full recordings can be cut down to any layout by column selection.
+		self.layout = get_layout(layout or source_layout)
+		self.columns = None
+		if self.layout["name"] != source_layout:
+			if source_layout != "full":
+				raise ValueError(f"Cannot build layout {self.layout['name']!r} from {source_layout!r} recordings")
+			self.columns = layout_columns(self.layout)
+			self.feature_size = len(self.columns)
+		elif self.feature_size != self.layout["size"]:
+			# The saved layout must describe the model input, or inference
+			# rejects the trained model.
+			raise ValueError(f"{self.layout['name']!r} recordings have {self.feature_size} values, "
+							 f"but the layout describes {self.layout['size']}")
+
+		counts = np.array([len(a) for a in self.arrays])
+		self.offsets = np.concatenate([[0], np.cumsum(counts)])
+		self.y = np.repeat(np.array(file_class, dtype=np.int32), counts)
+		self.rng = np.random.default_rng(seed)
+
+	@property
+	def num_classes(self):
+		return len(self.labels)
+
+	def __len__(self):
+		return len(self.y)
+
+	def gather(self, indices):
+		"""Return (X, one_hot_y) float32 arrays for global row indices."""
+		indices = np.asarray(indices)
+		X = np.empty((len(indices), self.feature_size), dtype=np.float32)
+		files = np.searchsorted(self.offsets, indices, side="right") - 1
+		for f in np.unique(files):
+			sel = files == f
+			rows = indices[sel] - self.offsets[f]
+			order = np.argsort(rows)
+			# Sorted reads are sequential on the memory map.
+			chunk = self.arrays[f][rows[order]]
+			if self.columns is not None:
+				chunk = chunk[:, self.columns]
+			X[np.flatnonzero(sel)[order]] = chunk
+		y = np.eye(self.num_classes, dtype=np.float32)[self.y[indices]]
+		return X, y
+
+	def split(self, val_split=0.2):
+		"""Return shuffled (train_indices, val_indices), stratified per class."""
+		train, val = [], []
+		for c in range(self.num_classes):
+			idx = np.flatnonzero(self.y == c)
+			self.rng.shuffle(idx)
+			n_val = int(round(len(idx) * val_split))
+			val.append(idx[:n_val])
+			train.append(idx[n_val:])
+		train = np.concatenate(train)
+		val = np.concatenate(val)
+		self.rng.shuffle(train)
+		return train, val
+
+	def tf_dataset(self, indices, batch_size=64, shuffle=True):
+		import tensorflow as tf
+
+		def load(batch):
+			return self.gather(batch)
+
+		ds = tf.data.Dataset.from_tensor_slices(indices.astype(np.int64))
+		if shuffle:
+			ds = ds.shuffle(len(indices), reshuffle_each_iteration=True)
+		ds = ds.batch(batch_size)
+		ds = ds.map(lambda b: tf.numpy_function(load, [b], (tf.float32, tf.float32)),
+					num_parallel_calls=tf.data.AUTOTUNE)
+		ds = ds.map(lambda X, y: (tf.ensure_shape(X, [None, self.feature_size]),
+								  tf.ensure_shape(y, [None, self.num_classes])))
+		return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def build_datasets(directory="recordings", val_split=0.2, batch_size=64, seed=0, layout=None):
+	"""Return (dataset, train_ds, val_ds) ready for ``model.fit``."""
+	data = EmotionDataset(directory, seed=seed, layout=layout)
+	train_idx, val_idx = data.split(val_split)
+	train_ds = data.tf_dataset(train_idx, batch_size, shuffle=True)
+	val_ds = data.tf_dataset(val_idx, batch_size, shuffle=False) if len(val_idx) else None
+	return data, train_ds, val_ds
@@ -0,0 +1,135 @@
+"""TensorFlow-free inference for the emotion MLP.
+
+``model.predict`` builds a whole batched data pipeline on every call, which
+is far too heavy for one 1x1020 row per frame. The trained model is just
+Dense layers, so its weights are exported once to ``model_weights.npz`` and
+the forward pass runs as plain NumPy matmuls plus a softmax. TensorFlow is
+only imported to do the export.
+
+	python emotion_engine.py export   # model.h5 -> model_weights.npz
+	python emotion_engine.py check    # parity against Keras on random inputs
+	python emotion_engine.py bench    # per-frame latency: predict / model() / NumPy
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+MODEL_PATH = "model.h5"
+WEIGHTS_PATH = "model_weights.npz"
+
+ACTIVATIONS = {
+	"linear": lambda x: x,
+	"relu": lambda x: np.maximum(x, 0.0, out=x),
+	"tanh": np.tanh,
+	"sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+}
+
+
+def softmax(x):
+	x = x - x.max(axis=-1, keepdims=True)
+	np.exp(x, out=x)
+	x /= x.sum(axis=-1, keepdims=True)
+	return x
+
+
+ACTIVATIONS["softmax"] = softmax
+
+
+class NumpyMLP:
+	def __init__(self, layers):
+		# layers: list of (kernel, bias, activation_name)
+		self.layers = [(w.astype(np.float32), b.astype(np.float32), ACTIVATIONS[a]) for w, b, a in layers]
+		self.input_size = self.layers[0][0].shape[0]
+
+	@classmethod
+	def load(cls, path=WEIGHTS_PATH):
+		data = np.load(path)
+		activations = json.loads(str(data["activations"]))
+		layers = [(data[f"W{i}"], data[f"b{i}"], a) for i, a in enumerate(activations)]
+		return cls(layers)
+
+	def __call__(self, x):
+		"""Return class probabilities for a (n, input_size) or (input_size,) array."""
+		x = np.asarray(x, dtype=np.float32).reshape(-1, self.input_size)
+		for w, b, act in self.layers:
+			x = act(x @ w + b)
+		return x
+
+
+def export_weights(model_path=MODEL_PATH, weights_path=WEIGHTS_PATH):
+	from keras.models import load_model
+
+	model = load_model(model_path)
+	arrays = {}
+	activations = []
+	for layer in model.layers:
+		weights = layer.get_weights()
+		if not weights:
+			continue  # InputLayer
+		if len(weights) != 2:
+			raise ValueError(f"Unsupported layer {layer.name}: only Dense layers can be exported")
+		i = len(activations)
+		arrays[f"W{i}"], arrays[f"b{i}"] = weights
+		activations.append(layer.get_config().get("activation", "linear"))
+	np.savez(weights_path, activations=json.dumps(activations), **arrays)
+	return weights_path
+
+
+def load_engine(model_path=MODEL_PATH, weights_path=WEIGHTS_PATH):
+	"""Load the NumPy engine, re-exporting when model.h5 is newer than the weights."""
+	if not os.path.exists(weights_path) or (
+			os.path.exists(model_path) and os.path.getmtime(model_path) > os.path.getmtime(weights_path)):
+		export_weights(model_path, weights_path)
+	return NumpyMLP.load(weights_path)
+
+
+def check(samples=256, atol=1e-5):
+	from keras.models import load_model
+
+	model = load_model(MODEL_PATH)
+	engine = load_engine()
+	x = np.random.default_rng(0).normal(0, 0.1, (samples, engine.input_size)).astype(np.float32)
+	expected = model.predict(x, verbose=0)
+	got = engine(x)
+	diff = float(np.abs(expected - got).max())
+	same_argmax = float((expected.argmax(1) == got.argmax(1)).mean())
+	print(f"max abs diff {diff:.2e}, argmax agreement {same_argmax:.3f}")
+	return diff <= atol and same_argmax == 1.0
+
+
+def bench(repeats=200):
+	import tensorflow as tf
+	from keras.models import load_model
+
+	model = load_model(MODEL_PATH)
+	engine = load_engine()
+	x = np.random.default_rng(0).normal(0, 0.1, (1, engine.input_size)).astype(np.float32)
+	forward = tf.function(lambda t: model(t, training=False))
+
+	runs = [
+		("model.predict", lambda: model.predict(x, verbose=0)),
+		("tf.function model()", lambda: forward(x).numpy()),
+		("NumPy engine", lambda: engine(x)),
+	]
+	for name, fn in runs:
+		fn()  # warm-up / tracing
+		t0 = time.perf_counter()
+		for _ in range(repeats):
+			fn()
+		print(f"{name:>20}: {(time.perf_counter() - t0) / repeats * 1000:.3f} ms/frame")
+
+
+if __name__ == "__main__":
+	command = sys.argv[1] if len(sys.argv) > 1 else "export"
+	if command == "export":
+		print(f"Weights written to {export_weights()}")
+	elif command == "check":
+		sys.exit(0 if check() else 1)
+	elif command == "bench":
+		bench()
+	else:
+		sys.exit(f"unknown command {command!r} (export, check, bench)")
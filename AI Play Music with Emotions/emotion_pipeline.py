@@ -0,0 +1,183 @@
+"""Pipelined capture / landmarks / classification / rendering for the emotion app.
+
+Running ``holis.process``, drawing three landmark sets and ``imshow`` one
+after another limits the camera FPS to the sum of all stages. Here each
+stage has its own thread:
+
+	capture -> landmarks (MediaPipe Holistic) -> features + handler -> render
+
+They are connected by one-slot, latest-frame-wins queues, so a slow stage
+drops stale frames instead of queuing them. Rendering stays on the main
+thread because of ``imshow``. The face-mesh contours are the most expensive
+overlay, and ``draw_face_mesh=False`` turns them off.
+
+``layout`` selects the feature layout (see features.py; default full).
+``handler(features, res)`` runs on the classification thread for frames that
+contain the landmarks the layout needs (a face, or a hand for the "hands"
+layout). It returns the text to overlay (or None). inference.py classifies in
+it; data_collection.py stores samples in it. For other frames, only the
+optional ``no_face()`` callback runs.
+"""
+
+import collections
+import threading
+import time
+
+import cv2
+import mediapipe as mp
+
+from features import extract_features, get_layout, new_buffer
+
+
+def draw_results(frm, res, text, draw_face_mesh=True):
+	"""Draw the landmarks of a Holistic result and the overlay text onto ``frm``."""
+	drawing = mp.solutions.drawing_utils
+	if draw_face_mesh:
+		drawing.draw_landmarks(frm, res.face_landmarks, mp.solutions.holistic.FACEMESH_CONTOURS)
+	drawing.draw_landmarks(frm, res.left_hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+	drawing.draw_landmarks(frm, res.right_hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+	if text is not None:
+		cv2.putText(frm, str(text), (50,50), cv2.FONT_ITALIC, 1, (255,0,0), 2)
+
+
+class LatestSlot:
+	"""One-slot queue: put() replaces whatever has not been taken yet."""
+
+	def __init__(self):
+		self._item = None
+		self._cond = threading.Condition()
+		self.dropped = 0
+
+	def put(self, item):
+		with self._cond:
+			if self._item is not None:
+				self.dropped += 1
+			self._item = item
+			self._cond.notify()
+
+	def get(self, timeout=0.1):
+		with self._cond:
+			if not self._cond.wait_for(lambda: self._item is not None, timeout):
+				return None
+			item, self._item = self._item, None
+			return item
+
+
+class StageTimer:
+	def __init__(self, window=100):
+		self._times = collections.defaultdict(lambda: collections.deque(maxlen=window))
+		self._lock = threading.Lock()
+
+	def add(self, stage, seconds):
+		with self._lock:
+			self._times[stage].append(seconds)
+
+	def summary(self):
+		with self._lock:
+			return {k: sum(v) / len(v) * 1000 for k, v in self._times.items() if v}
+
+
+class EmotionPipeline:
+	def __init__(self, handler, source=0, draw_face_mesh=True, window="window", no_face=None, layout=None):
+		self.handler = handler
+		self.layout = None if layout is None else get_layout(layout)
+		self.no_face = no_face
+		self.source = source
+		self.draw_face_mesh = draw_face_mesh
+		self.window = window
+		self.timer = StageTimer()
+		self.running = threading.Event()
+		self._frames = LatestSlot()
+		self._landmarks = LatestSlot()
+		self._results = LatestSlot()
+
+		self._holistic = mp.solutions.holistic
+
+	def stop(self):
+		self.running.clear()
+
+	def _capture(self, cap):
+		while self.running.is_set():
+			t0 = time.perf_counter()
+			ret, frm = cap.read()
+			if not ret:
+				self.stop()
+				break
+			frm = cv2.flip(frm, 1)
+			self.timer.add("capture", time.perf_counter() - t0)
+			self._frames.put((frm, t0))
+
+	def _landmark_worker(self):
+		# MediaPipe graphs are not shared between threads; this one lives here.
+		holis = self._holistic.Holistic()
+		while self.running.is_set():
+			item = self._frames.get()
+			if item is None:
+				continue
+			frm, captured = item
+			t0 = time.perf_counter()
+			res = holis.process(cv2.cvtColor(frm, cv2.COLOR_BGR2RGB))
+			self.timer.add("landmarks", time.perf_counter() - t0)
+			self._landmarks.put((frm, res, captured))
+		holis.close()
+
+	def _classify_worker(self):
+		buf = new_buffer(self.layout)
+		while self.running.is_set():
+			item = self._landmarks.get()
+			if item is None:
+				continue
+			frm, res, captured = item
+			text = None
+			t0 = time.perf_counter()
+			features = extract_features(res, buf, self.layout)
+			if features is not None:
+				text = self.handler(features, res)
+			elif self.no_face is not None:
+				self.no_face()
+			self.timer.add("classify", time.perf_counter() - t0)
+			self._results.put((frm, res, text, captured))
+
+	def _render(self, frm, res, text):
+		draw_results(frm, res, text, self.draw_face_mesh)
+
+	def run(self):
+		"""Run until Esc is pressed, the source ends or stop() is called; return stage timings."""
+		cap = cv2.VideoCapture(self.source)
+		self.running.set()
+		threads = [
+			threading.Thread(target=self._capture, args=(cap,), name="capture", daemon=True),
+			threading.Thread(target=self._landmark_worker, name="landmarks", daemon=True),
+			threading.Thread(target=self._classify_worker, name="classify", daemon=True),
+		]
+		for t in threads:
+			t.start()
+
+		while self.running.is_set():
+			item = self._results.get()
+			if item is None:
+				if cv2.waitKey(1) == 27:
+					break
+				continue
+			frm, res, text, captured = item
+			t0 = time.perf_counter()
+			self._render(frm, res, text)
+			self.timer.add("render", time.perf_counter() - t0)
+			self.timer.add("end_to_end", time.perf_counter() - captured)
+
+			stats = " | ".join(f"{k} {v:.1f}ms" for k, v in self.timer.summary().items())
+			cv2.putText(frm, stats, (10, frm.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0,255,255), 1)
+			cv2.imshow(self.window, frm)
+			if cv2.waitKey(1) == 27:
+				break
+
+		self.stop()
+		for t in threads:
+			t.join(timeout=1)
+		cap.release()
+		cv2.destroyAllWindows()
+
+		timings = self.timer.summary()
+		for stage, ms in timings.items():
+			print(f"{stage:>11}: {ms:.2f} ms")
+		return timings
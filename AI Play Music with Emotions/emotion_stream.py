@@ -0,0 +1,87 @@
+"""Turn per-frame emotion probabilities into debounced state-change events.
+
+Printing a label on every frame is noisy, and cannot drive music playback.
+EmotionStream keeps an exponentially weighted average of the softmax outputs
+and applies hysteresis before it changes state. A new emotion must
+
+* lead the smoothed distribution by at least ``margin`` over the current
+  state, and
+* keep that lead for ``hold_frames`` consecutive updates.
+
+Only then is ``on_change(event)`` called, so downstream work (choosing and
+starting a track) happens at event rate, not frame rate. Frames without a
+face never reach the classifier; the caller reports them with ``no_face()``,
+and after ``idle_frames`` of them the stream switches to state None.
+"""
+
+import time
+
+import numpy as np
+
+
+def print_hook(event):
+	print(f"[{event['time']:.2f}] {event['previous']} -> {event['state']} ({event['confidence']:.2f})")
+
+
+class EmotionStream:
+	def __init__(self, labels, on_change=print_hook, alpha=0.2, margin=0.15, hold_frames=8, idle_frames=60):
+		self.labels = [str(l) for l in labels]
+		self.on_change = on_change
+		self.alpha = alpha
+		self.margin = margin
+		self.hold_frames = hold_frames
+		self.idle_frames = idle_frames
+
+		self.smoothed = None
+		self.state = None
+		self._candidate = None
+		self._candidate_frames = 0
+		self._missing = 0
+		self.events = 0
+
+	def update(self, probs):
+		"""Feed one softmax vector; return the current (debounced) state."""
+		probs = np.asarray(probs, dtype=np.float32).ravel()
+		self._missing = 0
+		if self.smoothed is None:
+			self.smoothed = probs.copy()
+		else:
+			self.smoothed += self.alpha * (probs - self.smoothed)
+
+		best = int(self.smoothed.argmax())
+		if self.state is None:
+			lead_ok = True
+		else:
+			current = self.labels.index(self.state)
+			lead_ok = best != current and self.smoothed[best] - self.smoothed[current] >= self.margin
+
+		if not lead_ok:
+			self._candidate = None
+			self._candidate_frames = 0
+			return self.state
+
+		if best != self._candidate:
+			self._candidate = best
+			self._candidate_frames = 0
+		self._candidate_frames += 1
+		if self._candidate_frames >= self.hold_frames:
+			self._switch(self.labels[best], float(self.smoothed[best]))
+		return self.state
+
+	def no_face(self):
+		"""Record a frame without a face; the classifier is not run for it."""
+		self._missing += 1
+		if self._missing == self.idle_frames and self.state is not None:
+			self.smoothed = None
+			self._switch(None, 0.0)
+		return self.state
+
+	def _switch(self, state, confidence):
+		previous = self.state
+		self.state = state
+		self._candidate = None
+		self._candidate_frames = 0
+		self.events += 1
+		if self.on_change is not None:
+			self.on_change({"time": time.time(), "previous": previous, "state": state,
+							"confidence": confidence})
@@ -0,0 +1,208 @@
+"""Landmark feature extraction shared by data_collection.py and inference.py.
+
+The full feature vector is laid out exactly as before (1020 values):
+
+	face   468 points, (x, y) minus face point 1
+	left   21 points,  (x, y) minus left-hand point 8  (zeros if no hand)
+	right  21 points,  (x, y) minus right-hand point 8 (zeros if no hand)
+
+Each landmark list is copied into a preallocated float32 buffer with one
+np.fromiter call, and the reference point is subtracted in one vectorised
+operation.
+
+A layout can also select a subset of the face points and/or drop the hands
+(see LAYOUTS). The points keep the same order and the same reference point,
+so a subset is exactly a column selection of the full vector
+(``layout_columns``). That lets training cut full recordings down to any
+subset. training writes the layout to ``feature_layout.json`` next to
+``labels.npy``, and inference refuses a model whose input size does not match
+it.
+
+Run ``python features.py`` to benchmark extraction per layout against the old
+per-landmark loop.
+"""
+
+import itertools
+import json
+import time
+
+import numpy as np
+
+FACE_POINTS = 468
+HAND_POINTS = 21
+FACE_REF = 1
+HAND_REF = 8
+FEATURE_SIZE = 2 * (FACE_POINTS + 2 * HAND_POINTS)
+LAYOUT_FILE = "feature_layout.json"
+
+# name -> (MediaPipe face-mesh connection sets to keep, or None for all 468
+# points; include hands)
+LAYOUTS = {
+	"full": (None, True),
+	"expressive": (("LIPS", "LEFT_EYE", "RIGHT_EYE", "LEFT_EYEBROW", "RIGHT_EYEBROW"), True),
+	"expressive_no_hands": (("LIPS", "LEFT_EYE", "RIGHT_EYE", "LEFT_EYEBROW", "RIGHT_EYEBROW"), False),
+	"lips_brows": (("LIPS", "LEFT_EYEBROW", "RIGHT_EYEBROW"), False),
+	"hands": ((), True),
+}
+
+
+def get_layout(name="full"):
+	"""Return a layout dict: name, face point indices (None = all), hands, size."""
+	if isinstance(name, dict):
+		return name
+	groups, hands = LAYOUTS[name]
+	if groups is None:
+		face = None
+		n_face = FACE_POINTS
+	else:
+		import mediapipe as mp
+
+		face_mesh = mp.solutions.face_mesh
+		points = set()
+		for group in groups:
+			for a, b in getattr(face_mesh, f"FACEMESH_{group}"):
+				points.update((a, b))
+		face = sorted(points)
+		n_face = len(face)
+	size = 2 * n_face + (4 * HAND_POINTS if hands else 0)
+	return {"name": name, "face_indices": face, "hands": hands, "size": size}
+
+
+def layout_columns(layout):
+	"""Column indices of ``layout`` within the full 1020-value vector."""
+	layout = get_layout(layout)
+	face = range(FACE_POINTS) if layout["face_indices"] is None else layout["face_indices"]
+	cols = [c for i in face for c in (2 * i, 2 * i + 1)]
+	if layout["hands"]:
+		cols.extend(range(2 * FACE_POINTS, FEATURE_SIZE))
+	return np.array(cols, dtype=np.int64)
+
+
+def save_layout(layout, path=LAYOUT_FILE):
+	with open(path, "w") as f:
+		json.dump(get_layout(layout), f)
+
+
+def load_layout(path=LAYOUT_FILE):
+	with open(path) as f:
+		return json.load(f)
+
+
+def new_buffer(layout=None):
+	size = FEATURE_SIZE if layout is None else get_layout(layout)["size"]
+	return np.zeros(size, dtype=np.float32)
+
+
+def _fill(landmarks, out, ref):
+	points = out.reshape(-1, 2)
+	n = len(points)
+	flat = itertools.chain.from_iterable((p.x, p.y) for p in itertools.islice(landmarks, n))
+	out[:] = np.fromiter(flat, dtype=np.float32, count=2 * n)
+	points -= points[ref].copy()
+
+
+def _fill_subset(landmarks, out, indices, ref):
+	flat = itertools.chain.from_iterable((landmarks[i].x, landmarks[i].y) for i in indices)
+	out[:] = np.fromiter(flat, dtype=np.float32, count=2 * len(indices))
+	out.reshape(-1, 2)[:] -= (landmarks[ref].x, landmarks[ref].y)
+
+
+def _fill_hands(res, out):
+	if res.left_hand_landmarks:
+		_fill(res.left_hand_landmarks.landmark, out[:2 * HAND_POINTS], HAND_REF)
+	else:
+		out[:2 * HAND_POINTS] = 0.0
+
+	if res.right_hand_landmarks:
+		_fill(res.right_hand_landmarks.landmark, out[2 * HAND_POINTS:], HAND_REF)
+	else:
+		out[2 * HAND_POINTS:] = 0.0
+
+
+def extract_features(res, out=None, layout=None):
+	"""Fill ``out`` (or a new buffer) from a Holistic result.
+
+	``layout`` is None for the full vector, or a layout dict from get_layout
+	(names work too but re-resolve the indices on every call). Returns the
+	buffer, or None when the landmarks the layout needs were not detected: a
+	face for layouts with face points, at least one hand for hand-only
+	layouts (nothing is written in that case).
+	"""
+	layout = None if layout is None else get_layout(layout)
+	if layout is not None and layout["face_indices"] == []:
+		if not (res.left_hand_landmarks or res.right_hand_landmarks):
+			return None
+	elif not res.face_landmarks:
+		return None
+	if out is None:
+		out = new_buffer(layout)
+
+	if layout is None or layout["face_indices"] is None:
+		face_end = 2 * FACE_POINTS
+		_fill(res.face_landmarks.landmark, out[:face_end], FACE_REF)
+	else:
+		face_end = 2 * len(layout["face_indices"])
+		if face_end:
+			_fill_subset(res.face_landmarks.landmark, out[:face_end], layout["face_indices"], FACE_REF)
+
+	if layout is None or layout["hands"]:
+		_fill_hands(res, out[face_end:])
+	return out
+
+
+def _extract_features_loop(res):
+	"""The original nested-loop extraction, kept for benchmarking."""
+	lst = []
+	for i in res.face_landmarks.landmark:
+		lst.append(i.x - res.face_landmarks.landmark[1].x)
+		lst.append(i.y - res.face_landmarks.landmark[1].y)
+
+	if res.left_hand_landmarks:
+		for i in res.left_hand_landmarks.landmark:
+			lst.append(i.x - res.left_hand_landmarks.landmark[8].x)
+			lst.append(i.y - res.left_hand_landmarks.landmark[8].y)
+	else:
+		for i in range(42):
+			lst.append(0.0)
+
+	if res.right_hand_landmarks:
+		for i in res.right_hand_landmarks.landmark:
+			lst.append(i.x - res.right_hand_landmarks.landmark[8].x)
+			lst.append(i.y - res.right_hand_landmarks.landmark[8].y)
+	else:
+		for i in range(42):
+			lst.append(0.0)
+	return np.array(lst).reshape(1, -1)
+
+
+def benchmark(repeats=2000):
+	from types import SimpleNamespace
+
+	rng = np.random.default_rng(0)
+
+	def fake(n):
+		return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y)) for x, y in rng.random((n, 2))])
+
+	res = SimpleNamespace(face_landmarks=fake(FACE_POINTS), left_hand_landmarks=fake(HAND_POINTS),
+						  right_hand_landmarks=None)
+	full = extract_features(res)
+	assert np.allclose(_extract_features_loop(res)[0], full, atol=1e-6)
+
+	print(f"{'loop':>20}: {_time(lambda: _extract_features_loop(res), repeats):.1f} us/frame")
+	for name in LAYOUTS:
+		layout = get_layout(name)
+		buf = new_buffer(layout)
+		assert np.allclose(extract_features(res, buf, layout), full[layout_columns(layout)])
+		us = _time(lambda: extract_features(res, buf, layout), repeats)
+		print(f"{name:>20}: {us:.1f} us/frame ({layout['size']} features)")
+
+
+def _time(fn, repeats):
+	t0 = time.perf_counter()
+	for _ in range(repeats):
+		fn()
+	return (time.perf_counter() - t0) / repeats * 1e6
+
+
+if __name__ == "__main__":
+	benchmark()
@@ -1,70 +1,65 @@
+import contextlib
+import os
 import cv2 
 import numpy as np 
 import mediapipe as mp 
-from keras.models import load_model 
-
-
-model  = load_model("model.h5")
-label = np.load("labels.npy")
 
+from emotion_engine import load_engine
+from emotion_pipeline import EmotionPipeline, draw_results
+from emotion_stream import EmotionStream
+from features import LAYOUT_FILE, extract_features, load_layout, new_buffer
 
 
-holistic = mp.solutions.holistic
-hands = mp.solutions.hands
-holis = holistic.Holistic()
-drawing = mp.solutions.drawing_utils
-
-cap = cv2.VideoCapture(0)
+model  = load_engine("model.h5")
+label = np.load("labels.npy")
 
 
 
-while True:
-	lst = []
+# Created on first use by process_frame; the live app builds its own graph
+# on the pipeline's landmark thread.
+holis = None
+# Models trained before feature layouts existed use the full layout.
+layout = load_layout() if os.path.exists(LAYOUT_FILE) else None
+input_size = layout["size"] if layout else new_buffer().size
+if model.input_size != input_size:
+	raise SystemExit(f"model.h5 expects {model.input_size} features but {LAYOUT_FILE} "
+					 f"describes {input_size}; retrain or restore the matching layout file")
+feature_buffer = new_buffer(layout)
+DRAW_FACE_MESH = True  # the face-mesh contours are the most expensive overlay
 
-	_, frm = cap.read()
 
-	frm = cv2.flip(frm, 1)
+def no_stage(name):
+	return contextlib.nullcontext()
 
-	res = holis.process(cv2.cvtColor(frm, cv2.COLOR_BGR2RGB))
 
+# Smooths the per-frame outputs and calls the playback hook only when the
+# emotion actually changes (see emotion_stream.py).
+stream = EmotionStream(label)
 
-	if res.face_landmarks:
-		for i in res.face_landmarks.landmark:
-			lst.append(i.x - res.face_landmarks.landmark[1].x)
-			lst.append(i.y - res.face_landmarks.landmark[1].y)
 
-		if res.left_hand_landmarks:
-			for i in res.left_hand_landmarks.landmark:
-				lst.append(i.x - res.left_hand_landmarks.landmark[8].x)
-				lst.append(i.y - res.left_hand_landmarks.landmark[8].y)
-		else:
-			for i in range(42):
-				lst.append(0.0)
+def classify(features, res):
+	return stream.update(model(features))
 
-		if res.right_hand_landmarks:
-			for i in res.right_hand_landmarks.landmark:
-				lst.append(i.x - res.right_hand_landmarks.landmark[8].x)
-				lst.append(i.y - res.right_hand_landmarks.landmark[8].y)
-		else:
-			for i in range(42):
-				lst.append(0.0)
 
-		lst = np.array(lst).reshape(1,-1)
+def process_frame(frm, stage=no_stage):
+	"""One frame of the same landmarks -> classify -> render path, for the headless harness."""
+	global holis
+	if holis is None:
+		holis = mp.solutions.holistic.Holistic()
+	with stage("landmarks"):
+		res = holis.process(cv2.cvtColor(frm, cv2.COLOR_BGR2RGB))
 
-		pred = label[np.argmax(model.predict(lst))]
+	with stage("features"):
+		features = extract_features(res, feature_buffer, layout)
 
-		print(pred)
-		cv2.putText(frm, pred, (50,50),cv2.FONT_ITALIC, 1, (255,0,0),2)
+	with stage("classify"):
+		text = classify(features, res) if features is not None else stream.no_face()
 
-		
-	drawing.draw_landmarks(frm, res.face_landmarks, holistic.FACEMESH_CONTOURS)
-	drawing.draw_landmarks(frm, res.left_hand_landmarks, hands.HAND_CONNECTIONS)
-	drawing.draw_landmarks(frm, res.right_hand_landmarks, hands.HAND_CONNECTIONS)
+	with stage("render"):
+		draw_results(frm, res, text, DRAW_FACE_MESH)
 
-	cv2.imshow("window", frm)
+	return frm
 
-	if cv2.waitKey(1) == 27:
-		cv2.destroyAllWindows()
-		cap.release()
-		break
 
+if __name__ == "__main__":
+	EmotionPipeline(classify, draw_face_mesh=DRAW_FACE_MESH, no_face=stream.no_face, layout=layout).run()
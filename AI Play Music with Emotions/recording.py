@@ -0,0 +1,154 @@
+"""Append-able on-disk recording format for emotion training data.
+
+data_collection.py used to keep every sample in a Python list and only
+write ``<name>.npy`` at the end, so a crash lost the whole session. Now it
+records into a directory:
+
+	recordings/
+		index.json                  feature layout/size + every shard per label
+		<label>/<session>-00000.npy float32 chunk of ``flush_every`` rows
+		<label>/<session>-00001.npy ...
+
+Samples are flushed in batches as float32. After each flush, the index is
+rewritten atomically, so a crash loses at most one unflushed batch. Every
+run of the collector is a new session with a unique ID (timestamp plus a
+random suffix), and shards are created exclusively, so two sessions can
+never overwrite each other's files. A label can be recorded across many
+sessions, and ``count(label)`` tells a resumed session how much is already
+there. dataset.py memory-maps the shards listed in the index.
+
+``python recording.py check`` records into a temporary root and verifies the
+index keeps its layout header and every session's shards.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+INDEX = "index.json"
+
+
+def load_index(root):
+	path = os.path.join(root, INDEX)
+	if not os.path.exists(path):
+		return {"layout": None, "feature_size": None, "labels": {}}
+	with open(path) as f:
+		return json.load(f)
+
+
+def _save_index(root, index):
+	tmp = os.path.join(root, f"{INDEX}.{os.getpid()}.tmp")
+	with open(tmp, "w") as f:
+		json.dump(index, f, indent=1)
+	os.replace(tmp, os.path.join(root, INDEX))
+
+
+def count(root, label):
+	return sum(s["rows"] for s in load_index(root)["labels"].get(label, []))
+
+
+def shard_paths(root):
+	"""Return {label: [absolute shard paths]} from the index."""
+	index = load_index(root)
+	return {label: [os.path.join(root, s["file"]) for s in shards]
+			for label, shards in index["labels"].items()}
+
+
+class Recorder:
+	def __init__(self, root, label, feature_size, flush_every=32, layout="full"):
+		os.makedirs(os.path.join(root, label), exist_ok=True)
+		self.root = root
+		self.label = label
+		self.feature_size = feature_size
+		self.flush_every = flush_every
+		self.session = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+		self.layout = layout
+		self.index = self._claim(load_index(root))
+		self.index["labels"].setdefault(label, [])
+
+		self._buffer = np.empty((flush_every, feature_size), dtype=np.float32)
+		self._pending = 0
+		self._chunk = 0
+		self.recorded = 0
+
+	def _claim(self, index):
+		"""Write this recorder's layout header into a new index, or check it matches."""
+		if index["feature_size"] is None:
+			index["feature_size"] = self.feature_size
+			index["layout"] = self.layout
+		elif index["feature_size"] != self.feature_size or index.get("layout", "full") != self.layout:
+			raise ValueError(f"{self.root} holds {index.get('layout', 'full')!r} features "
+							 f"({index['feature_size']} values), not {self.layout!r} ({self.feature_size})")
+		return index
+
+	@property
+	def total(self):
+		"""Samples stored for this label across all sessions, including unflushed ones."""
+		return sum(s["rows"] for s in self.index["labels"][self.label]) + self._pending
+
+	def add(self, features):
+		self._buffer[self._pending] = features
+		self._pending += 1
+		self.recorded += 1
+		if self._pending == self.flush_every:
+			self.flush()
+
+	def flush(self):
+		if self._pending == 0:
+			return
+		name = f"{self.label}/{self.session}-{self._chunk:05d}.npy"
+		# "x" fails on a name collision instead of silently replacing a shard.
+		with open(os.path.join(self.root, name), "xb") as f:
+			np.save(f, self._buffer[:self._pending])
+		# Re-read the index so shards flushed by another session since we
+		# started are kept. On a new root it has no header yet; _claim adds ours.
+		index = self._claim(load_index(self.root))
+		index["labels"].setdefault(self.label, []).append(
+			{"file": name, "rows": self._pending, "session": self.session})
+		_save_index(self.root, index)
+		self.index = index
+		self._chunk += 1
+		self._pending = 0
+
+	def close(self):
+		self.flush()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+
+def check():
+	"""Record into a fresh root and verify the header and shards survive."""
+	with tempfile.TemporaryDirectory() as root:
+		for value in (1.0, 2.0):
+			with Recorder(root, "happy", 4, flush_every=2, layout="expressive") as rec:
+				for _ in range(3):
+					rec.add(np.full(4, value, dtype=np.float32))
+		index = load_index(root)
+		ok = index["layout"] == "expressive" and index["feature_size"] == 4
+		rows = np.concatenate([np.load(p) for p in shard_paths(root)["happy"]])
+		ok = ok and sorted(rows[:, 0].tolist()) == [1.0] * 3 + [2.0] * 3
+		try:
+			Recorder(root, "sad", 6, layout="full")
+			ok = False
+		except ValueError:
+			pass
+	print(f"layout {index['layout']!r}, {index['feature_size']} values, rows {rows[:, 0].tolist()}: "
+		  f"{'ok' if ok else 'FAILED'}")
+	return ok
+
+
+if __name__ == "__main__":
+	command = sys.argv[1] if len(sys.argv) > 1 else "check"
+	if command == "check":
+		sys.exit(0 if check() else 1)
+	sys.exit(f"unknown command {command!r} (check)")
@@ -0,0 +1,176 @@
+"""Hyperparameter sweep and size/latency benchmark for the emotion MLP.
+
+data_training.py hard-codes a 512->256 network trained for 50 epochs. This
+script trains one model per combination of
+
+	landmark layouts      --layouts "full,expressive"  (see features.LAYOUTS)
+	hidden layer widths   --widths "512,256;256,128;128;64"
+	PCA input dimensions  --pca "0,64,128,256"   (0 = raw layout features)
+	epochs                --epochs "20,50"
+
+For each one it records validation accuracy, parameter count, .h5 file size
+and single-sample latency of the deployed NumPy engine (emotion_engine.py).
+It then writes ``sweep/report.json`` and a Markdown table. Rows on the
+accuracy/latency Pareto front are marked.
+
+PCA is fitted with NumPy and baked into the model as a first linear Dense
+layer, so every candidate is still a plain Dense MLP. That means any of them
+can be copied over model.h5 and used by inference.py unchanged, together
+with its ``<name>.layout.json`` copied to feature_layout.json. Per-layout
+feature extraction cost is reported by ``python features.py``.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+
+from dataset import EmotionDataset
+from emotion_engine import NumpyMLP, export_weights
+from features import save_layout
+
+
+def fit_pca(X, dims):
+	"""Return (components (dims, n), mean (n,)) from an SVD of ``X``."""
+	mean = X.mean(axis=0)
+	_, _, vt = np.linalg.svd(X - mean, full_matrices=False)
+	return vt[:dims], mean
+
+
+def build_model(input_size, widths, num_classes, pca=None):
+	from keras.layers import Dense, Input
+	from keras.models import Model
+
+	ip = Input(shape=(input_size,))
+	m = ip
+	if pca is not None:
+		components, mean = pca
+		proj = Dense(len(components), activation="linear", name="pca")
+		m = proj(m)
+		proj.set_weights([components.T.astype(np.float32), (-mean @ components.T).astype(np.float32)])
+		proj.trainable = False
+	for w in widths:
+		m = Dense(w, activation="relu")(m)
+	op = Dense(num_classes, activation="softmax")(m)
+	model = Model(inputs=ip, outputs=op)
+	model.compile(optimizer="rmsprop", loss="categorical_crossentropy", metrics=["acc"])
+	return model
+
+
+def single_sample_latency(engine, repeats=500):
+	x = np.zeros((1, engine.input_size), dtype=np.float32)
+	engine(x)
+	t0 = time.perf_counter()
+	for _ in range(repeats):
+		engine(x)
+	return (time.perf_counter() - t0) / repeats * 1000
+
+
+def pareto(rows):
+	"""Mark rows not dominated on (higher val_acc, lower latency_ms)."""
+	for r in rows:
+		r["pareto"] = not any(
+			o is not r and o["val_acc"] >= r["val_acc"] and o["latency_ms"] <= r["latency_ms"]
+			and (o["val_acc"] > r["val_acc"] or o["latency_ms"] < r["latency_ms"])
+			for o in rows)
+	return rows
+
+
+def run_sweep(directory, widths_list, pca_dims, epochs_list, out_dir="sweep", batch_size=64,
+			  pca_samples=20000, layouts=("full",)):
+	os.makedirs(out_dir, exist_ok=True)
+	rows = []
+	for layout in layouts:
+		rows.extend(_sweep_layout(directory, layout, widths_list, pca_dims, epochs_list,
+								  out_dir, batch_size, pca_samples))
+	return _write_report(rows, out_dir)
+
+
+def _sweep_layout(directory, layout, widths_list, pca_dims, epochs_list, out_dir, batch_size, pca_samples):
+	# The same seed gives every layout the same train/validation split.
+	data = EmotionDataset(directory, layout=layout)
+	train_idx, val_idx = data.split(0.2)
+	if len(val_idx) == 0:
+		raise ValueError("Not enough samples for a validation split")
+	train_ds = data.tf_dataset(train_idx, batch_size, shuffle=True)
+	val_ds = data.tf_dataset(val_idx, batch_size, shuffle=False)
+	pca_fit_X, _ = data.gather(np.sort(train_idx[:pca_samples]))
+
+	rows = []
+	for widths, dims, epochs in itertools.product(widths_list, pca_dims, epochs_list):
+		if dims and dims >= data.feature_size:
+			continue
+		name = f"{layout}_w{'-'.join(map(str, widths))}_pca{dims or 'none'}_e{epochs}"
+		print(f"== {name}")
+		pca = fit_pca(pca_fit_X, dims) if dims else None
+		model = build_model(data.feature_size, widths, data.num_classes, pca)
+		t0 = time.perf_counter()
+		model.fit(train_ds, epochs=epochs, verbose=0)
+		train_s = time.perf_counter() - t0
+		_, val_acc = model.evaluate(val_ds, verbose=0)
+
+		h5 = os.path.join(out_dir, f"{name}.h5")
+		model.save(h5)
+		weights = os.path.join(out_dir, f"{name}.npz")
+		export_weights(h5, weights)
+		save_layout(data.layout, os.path.join(out_dir, f"{name}.layout.json"))
+		row = {
+			"name": name,
+			"layout": layout,
+			"features": data.feature_size,
+			"widths": list(widths),
+			"pca": dims,
+			"epochs": epochs,
+			"val_acc": round(float(val_acc), 4),
+			"params": int(model.count_params()),
+			"h5_bytes": os.path.getsize(h5),
+			"latency_ms": round(single_sample_latency(NumpyMLP.load(weights)), 4),
+			"train_seconds": round(train_s, 1),
+			"model_path": h5,
+		}
+		print(json.dumps(row))
+		rows.append(row)
+	return rows
+
+
+def _write_report(rows, out_dir):
+	rows = pareto(rows)
+	rows.sort(key=lambda r: (-r["val_acc"], r["latency_ms"]))
+	with open(os.path.join(out_dir, "report.json"), "w") as f:
+		json.dump({"results": rows}, f, indent=2)
+	with open(os.path.join(out_dir, "report.md"), "w") as f:
+		f.write("| model | layout | features | val acc | params | h5 KB | latency ms | pareto |\n")
+		f.write("|---|---|---|---|---|---|---|---|\n")
+		for r in rows:
+			f.write(f"| {r['name']} | {r['layout']} | {r['features']} | {r['val_acc']:.4f} | {r['params']} | "
+					f"{r['h5_bytes'] / 1024:.0f} | {r['latency_ms']:.4f} | {'*' if r['pareto'] else ''} |\n")
+	return rows
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--data", default="recordings")
+	parser.add_argument("--layouts", default="full")
+	parser.add_argument("--widths", default="512,256;256,128;128;64")
+	parser.add_argument("--pca", default="0,64,128,256")
+	parser.add_argument("--epochs", default="20,50")
+	parser.add_argument("--out", default="sweep")
+	args = parser.parse_args()
+
+	widths_list = [tuple(int(v) for v in w.split(",")) for w in args.widths.split(";")]
+	pca_dims = [int(v) for v in args.pca.split(",")]
+	epochs_list = [int(v) for v in args.epochs.split(",")]
+
+	rows = run_sweep(args.data, widths_list, pca_dims, epochs_list, args.out,
+					 layouts=args.layouts.split(","))
+	print(f"\nPareto front (see {args.out}/report.md):")
+	for r in rows:
+		if r["pareto"]:
+			print(f"  {r['name']}: acc {r['val_acc']:.4f}, {r['latency_ms']:.4f} ms, {r['params']} params")
+
+
+if __name__ == "__main__":
+	main()
@@ -1,31 +1,110 @@
+import contextlib
+import logging
+import threading
+import time
+
 import cv2
 from ultralytics import YOLO
 
+from autotune import AdaptiveController
+from pipeline import CaptureThread, FPSCounter, LatestQueue
+from render import Renderer
+
 model = YOLO("yolov8n")
+renderer = Renderer(model.names)
+
+TARGET_FPS = 15  # the controller trades imgsz / frame skipping to hold this
+controller = AdaptiveController(target_fps=TARGET_FPS)
+# The headless harness bypasses the controller and always uses this size, so
+# its numbers stay comparable between runs; it records BENCHMARK_CONFIG.
+BENCHMARK_IMGSZ = 640
+BENCHMARK_CONFIG = {"imgsz": BENCHMARK_IMGSZ}
+
+
+def no_stage(name):
+    return contextlib.nullcontext()
+
+
+def infer(frame):
+    started = time.perf_counter()
+    results = model(frame, imgsz=controller.imgsz, verbose=False)[0]
+    controller.record(time.perf_counter() - started)
+    return results
+
+
+def process_frame(frame, stage=no_stage):
+    """Detect and draw on one frame at BENCHMARK_IMGSZ; used by the headless benchmark harness."""
+    with stage("inference"):
+        results = model(frame, imgsz=BENCHMARK_IMGSZ, verbose=False)[0]
+    with stage("render"):
+        renderer.draw(frame, results.boxes)
+    return frame
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    cap = cv2.VideoCapture(0)  # webcam
+
+    # capture thread -> (latest frame) -> inference thread -> (latest result) -> render loop
+    capture = CaptureThread(cap)
+    results_queue = LatestQueue(maxsize=1)
+    infer_fps = FPSCounter()
+    render_fps = FPSCounter()
+    running = threading.Event()
+    running.set()
+
+    def inference_worker():
+        results = None
+        while running.is_set():
+            item = capture.frames.get(timeout=0.1)
+            if item is None:
+                if capture.ended.is_set():
+                    break
+                continue
+            frame, captured_at = item
+            if results is not None and not controller.should_infer():
+                # Skipped frame: show it with the previous boxes.
+                results_queue.put((frame, results, captured_at))
+                continue
+            results = infer(frame)
+            infer_fps.tick()
+            results_queue.put((frame, results, captured_at))
+
+    worker = threading.Thread(target=inference_worker, name="inference", daemon=True)
+    capture.start()
+    worker.start()
 
-cap = cv2.VideoCapture(0)  # webcam
+    while True:
+        item = results_queue.get(timeout=0.1)
+        if item is None:
+            if not worker.is_alive():
+                break
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+            continue
+        frame, results, captured_at = item
 
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        break
+        renderer.draw(frame, results.boxes)
 
-    results = model(frame)[0]
+        render_fps.tick()
+        latency_ms = (time.perf_counter() - captured_at) * 1000
+        stats = (f"capture {capture.fps.fps:.1f} fps | inference {infer_fps.fps:.1f} fps | "
+                 f"display {render_fps.fps:.1f} fps | latency {latency_ms:.0f} ms | "
+                 f"imgsz {controller.imgsz} skip {controller.skip}")
+        cv2.putText(frame, stats, (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
 
-    for box in results.boxes:
-        x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-        conf = float(box.conf[0])
-        cls = int(box.cls[0])
-        label = f"{model.names[cls]} {conf:.2f}"
+        cv2.imshow("YOLOv8 Detection", frame)
 
-        cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
-        cv2.putText(frame, label, (x1, y1 - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
+        if cv2.waitKey(1) & 0xFF == ord('q'):  # press q to quit
+            break
 
-    cv2.imshow("YOLOv8 Detection", frame)
+    running.clear()
+    capture.stop()
+    capture.join(timeout=1)
+    worker.join(timeout=1)
+    cap.release()
+    cv2.destroyAllWindows()
 
-    if cv2.waitKey(1) & 0xFF == ord('q'):  # press q to quit
-        break
 
-cap.release()
-cv2.destroyAllWindows()
+if __name__ == "__main__":
+    main()
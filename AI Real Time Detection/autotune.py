@@ -0,0 +1,78 @@
+"""Adaptive image-size / frame-skip controller for hitting a target FPS.
+
+The controller tracks a rolling median of inference latency and moves along
+a ladder of quality levels. The best level is the largest ``imgsz`` with no
+frame skipping:
+
+    (640, skip 1) -> (480, 1) -> (320, 1) -> (320, 2) -> (320, 3) ...
+
+When latency is over budget it steps down one level. When latency has been
+well under budget for a whole window it steps back up. After each change it
+waits a cooldown, so it does not oscillate. Each decision is logged through
+the ``autotune`` logger, so its behaviour can be compared across machines.
+"""
+
+import collections
+import logging
+import statistics
+import time
+
+log = logging.getLogger("autotune")
+
+
+class AdaptiveController:
+    def __init__(self, target_fps=15.0, sizes=(640, 480, 320), max_skip=4,
+                 window=20, cooldown=30, headroom=0.7):
+        self.target_fps = target_fps
+        self.budget = 1.0 / target_fps
+        self.levels = [(s, 1) for s in sizes] + [(sizes[-1], k) for k in range(2, max_skip + 1)]
+        self.level = 0
+        self.window = window
+        self.cooldown = cooldown
+        self.headroom = headroom
+
+        self._latencies = collections.deque(maxlen=window)
+        self._since_change = 0
+        self._frame = 0
+
+    @property
+    def imgsz(self):
+        return self.levels[self.level][0]
+
+    @property
+    def skip(self):
+        return self.levels[self.level][1]
+
+    def should_infer(self):
+        """Call once per captured frame; False means reuse the last result."""
+        self._frame += 1
+        return self._frame % self.skip == 0
+
+    def record(self, latency):
+        """Record one inference latency (seconds) and maybe change level."""
+        self._latencies.append(latency)
+        self._since_change += 1
+        if len(self._latencies) < self.window or self._since_change < self.cooldown:
+            return
+
+        median = statistics.median(self._latencies)
+        # With frame skipping, only every ``skip``-th frame costs an inference.
+        effective = median / self.skip
+
+        if effective > self.budget and self.level < len(self.levels) - 1:
+            self._change(self.level + 1, median, "over budget")
+        elif self.level > 0:
+            up_size, up_skip = self.levels[self.level - 1]
+            # Predict latency at the next level up (cost ~ pixels).
+            predicted = median * (up_size / self.imgsz) ** 2 / up_skip
+            if predicted < self.budget * self.headroom:
+                self._change(self.level - 1, median, "headroom")
+
+    def _change(self, level, median, reason):
+        old = self.levels[self.level]
+        self.level = level
+        self._latencies.clear()
+        self._since_change = 0
+        log.info("%.3f %s: median latency %.1f ms (budget %.1f ms), imgsz %d skip %d -> imgsz %d skip %d",
+                 time.time(), reason, median * 1000, self.budget * 1000,
+                 old[0], old[1], self.imgsz, self.skip)
@@ -0,0 +1,260 @@
+"""Serve YOLO detections for several camera streams from one process.
+
+Each source (device index, video file or RTSP/HTTP URL) gets its own
+CaptureThread. On every tick, the inference loop gathers the newest frame
+from each source that has one and runs a single batched YOLO call on them.
+Annotated frames go out as MJPEG and detections as JSON over HTTP:
+
+    /                     index page with all streams
+    /stream/<i>.mjpg      MJPEG stream of source i
+    /detections           latest detections for all sources (JSON)
+    /detections/<i>       latest detections for source i (JSON)
+    /stats                per-stream capture/inference FPS (JSON)
+
+Local video files can stand in for cameras. ``--pace`` plays them at their
+native frame rate and ``--loop`` rewinds them at the end:
+
+    python multi_stream_server.py a.mp4 b.mp4 rtsp://host/cam 0 --pace --loop --port 8080
+
+The server has no authentication and listens on 127.0.0.1 unless ``--host``
+says otherwise. Source URLs are published with any ``user:password@``
+removed.
+"""
+
+import argparse
+import html
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+from pipeline import CaptureThread, FPSCounter
+from render import Renderer
+
+
+def redact_source(source):
+    """Return ``source`` with the user:password@ part of a URL removed."""
+    parts = urllib.parse.urlsplit(source)
+    if not parts.netloc or "@" not in parts.netloc:
+        return source
+    return urllib.parse.urlunsplit(parts._replace(netloc=parts.netloc.rsplit("@", 1)[1]))
+
+
+def open_source(source):
+    if source.isdigit():
+        return cv2.VideoCapture(int(source))
+    return cv2.VideoCapture(source)
+
+
+class Stream:
+    def __init__(self, index, source, pace=False, loop=False):
+        self.index = index
+        self.source = source
+        self.label = redact_source(source)
+        self.cap = open_source(source)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open source {self.label!r}")
+        is_file = not source.isdigit() and "://" not in source
+        pace_fps = (self.cap.get(cv2.CAP_PROP_FPS) or 30.0) if pace and is_file else None
+        self.capture = CaptureThread(self.cap, name=f"capture-{index}", pace_fps=pace_fps,
+                                     loop=loop and is_file)
+        self.infer_fps = FPSCounter()
+
+        self._cond = threading.Condition()
+        self.jpeg = None
+        self.jpeg_seq = 0
+        self.detections = []
+        self.updated_at = None
+
+    def publish(self, jpeg, detections):
+        with self._cond:
+            self.jpeg = jpeg
+            self.jpeg_seq += 1
+            self.detections = detections
+            self.updated_at = time.time()
+            self._cond.notify_all()
+
+    def wait_jpeg(self, last_seq, timeout=1.0):
+        with self._cond:
+            self._cond.wait_for(lambda: self.jpeg_seq != last_seq, timeout)
+            return self.jpeg, self.jpeg_seq
+
+    def stats(self):
+        return {
+            "source": self.label,
+            "capture_fps": round(self.capture.fps.fps, 2),
+            "inference_fps": round(self.infer_fps.fps, 2),
+            "dropped_frames": self.capture.frames.dropped,
+            "alive": not self.capture.ended.is_set(),
+        }
+
+
+class DetectionServer:
+    def __init__(self, model, streams, imgsz=640, conf=0.25, jpeg_quality=80):
+        self.model = model
+        self.streams = streams
+        self.imgsz = imgsz
+        self.conf = conf
+        self.jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        self.renderer = Renderer(model.names)
+        self.batch_fps = FPSCounter()
+        self.running = True
+
+    def inference_loop(self):
+        while self.running:
+            batch = []
+            for stream in self.streams:
+                item = stream.capture.frames.get(timeout=0)
+                if item is not None:
+                    batch.append((stream, item[0]))
+            if not batch:
+                if all(s.capture.ended.is_set() for s in self.streams):
+                    break
+                time.sleep(0.002)
+                continue
+
+            results = self.model([frame for _, frame in batch], imgsz=self.imgsz,
+                                 conf=self.conf, verbose=False)
+            self.batch_fps.tick()
+            for (stream, frame), result in zip(batch, results):
+                data = result.boxes.data.cpu().numpy()
+                self.renderer.draw(frame, data)
+                ok, jpeg = cv2.imencode(".jpg", frame, self.jpeg_params)
+                detections = [
+                    {"class": self.model.names[int(c)], "conf": round(float(p), 3),
+                     "box": [round(float(v), 1) for v in (x1, y1, x2, y2)]}
+                    for x1, y1, x2, y2, p, c in data[:, :6]
+                ]
+                if ok:
+                    stream.publish(jpeg.tobytes(), detections)
+                stream.infer_fps.tick()
+
+    def stats(self):
+        return {
+            "batch_fps": round(self.batch_fps.fps, 2),
+            "streams": [s.stats() for s in self.streams],
+        }
+
+    def start(self):
+        for stream in self.streams:
+            stream.capture.start()
+        worker = threading.Thread(target=self.inference_loop, name="inference", daemon=True)
+        worker.start()
+        return worker
+
+    def stop(self):
+        self.running = False
+        for stream in self.streams:
+            stream.capture.stop()
+
+
+def make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        def _json(self, payload, status=200):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream_index(self, part):
+            try:
+                i = int(part)
+                return server.streams[i]
+            except (ValueError, IndexError):
+                return None
+
+        def do_GET(self):
+            parts = self.path.strip("/").split("/")
+            if self.path == "/":
+                links = "".join(f'<h3>{s.index}: {html.escape(s.label)}</h3><img src="/stream/{s.index}.mjpg">'
+                                for s in server.streams)
+                body = f"<html><body>{links}</body></html>".encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif parts[0] == "stats":
+                self._json(server.stats())
+            elif parts[0] == "detections" and len(parts) == 1:
+                self._json([{"stream": s.index, "updated_at": s.updated_at, "detections": s.detections}
+                            for s in server.streams])
+            elif parts[0] == "detections" and len(parts) == 2:
+                stream = self._stream_index(parts[1])
+                if stream is None:
+                    self._json({"error": "unknown stream"}, 404)
+                else:
+                    self._json({"stream": stream.index, "updated_at": stream.updated_at,
+                                "detections": stream.detections})
+            elif parts[0] == "stream" and len(parts) == 2 and parts[1].endswith(".mjpg"):
+                stream = self._stream_index(parts[1][:-5])
+                if stream is None:
+                    self._json({"error": "unknown stream"}, 404)
+                    return
+                self._mjpeg(stream)
+            else:
+                self._json({"error": "not found"}, 404)
+
+        def _mjpeg(self, stream):
+            self.send_response(200)
+            self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+            self.end_headers()
+            seq = -1
+            try:
+                while server.running:
+                    jpeg, new_seq = stream.wait_jpeg(seq)
+                    if jpeg is None or new_seq == seq:
+                        continue
+                    seq = new_seq
+                    self.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\n"
+                                     + f"Content-Length: {len(jpeg)}\r\n\r\n".encode()
+                                     + jpeg + b"\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="device index, video file or RTSP/HTTP URL")
+    parser.add_argument("--model", default="yolov8n")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="use 0.0.0.0 to serve other machines (there is no authentication)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pace", action="store_true", help="play video files at their native FPS")
+    parser.add_argument("--loop", action="store_true", help="rewind video files at the end")
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+    model = YOLO(args.model)
+    streams = [Stream(i, s, pace=args.pace, loop=args.loop) for i, s in enumerate(args.sources)]
+    server = DetectionServer(model, streams, imgsz=args.imgsz, conf=args.conf)
+    server.start()
+
+    httpd = ThreadingHTTPServer((args.host, args.port), make_handler(server))
+    httpd.daemon_threads = True
+    print(f"Serving {len(streams)} streams on http://{args.host}:{args.port}/")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        httpd.server_close()
+        for stream in streams:
+            stream.cap.release()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Building blocks for threaded capture -> inference -> render loops.
+
+LatestQueue    bounded queue that drops the oldest item when full, so a slow
+               consumer always gets the freshest frame instead of a backlog.
+CaptureThread  reads a cv2.VideoCapture as fast as the camera delivers and
+               keeps only the latest (frame, timestamp) pair.
+FPSCounter     rolling frames-per-second over the last N ticks.
+"""
+
+import collections
+import threading
+import time
+
+import cv2
+
+
+class LatestQueue:
+    def __init__(self, maxsize=1):
+        self._items = collections.deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)  # deque(maxlen) discards the oldest
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return the oldest queued item, or None after ``timeout`` seconds."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
+
+
+class FPSCounter:
+    def __init__(self, window=30):
+        self._ticks = collections.deque(maxlen=window)
+
+    def tick(self):
+        self._ticks.append(time.perf_counter())
+
+    @property
+    def fps(self):
+        if len(self._ticks) < 2:
+            return 0.0
+        span = self._ticks[-1] - self._ticks[0]
+        return (len(self._ticks) - 1) / span if span > 0 else 0.0
+
+
+class CaptureThread(threading.Thread):
+    """Continuously read frames from ``cap`` into a one-slot LatestQueue.
+
+    Video files are read as fast as they decode unless ``pace_fps`` is set,
+    which makes a file behave like a live camera. ``loop`` rewinds a file at
+    its end instead of stopping.
+    """
+
+    def __init__(self, cap, name="capture", pace_fps=None, loop=False):
+        super().__init__(name=name, daemon=True)
+        self.cap = cap
+        self.frames = LatestQueue(maxsize=1)
+        self.fps = FPSCounter()
+        self.pace_fps = pace_fps
+        self.loop = loop
+        self.running = True
+        self.ended = threading.Event()
+
+    def run(self):
+        interval = 1.0 / self.pace_fps if self.pace_fps else 0.0
+        next_at = time.perf_counter()
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret and self.loop:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = self.cap.read()
+            if not ret:
+                break
+            if interval:
+                next_at += interval
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_at = time.perf_counter()
+            self.fps.tick()
+            self.frames.put((frame, time.perf_counter()))
+        self.ended.set()
+
+    def stop(self):
+        self.running = False
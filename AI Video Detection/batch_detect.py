@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Batch YOLO detection over a directory of videos.
+
+The Colab cells take one uploaded video at a time. This script runs
+detection on every video in a directory. Videos are spread across a
+process pool, and each worker loads the YOLO model once in its
+initializer. For each finished video, one JSON line goes into the
+manifest with the timing and a detection summary. Videos already
+listed in the manifest are skipped, so an interrupted job can be
+re-run.
+
+Usage:
+    python batch_detect.py videos/ --workers 8 --manifest manifest.jsonl
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+
+_model = None
+_options = None
+
+
+def _init_worker(model_path, options, threads_per_worker):
+    """Load the model once per worker process."""
+    global _model, _options
+    # Each worker uses only its share of the cores, so N workers do not
+    # fight over the same CPUs.
+    import torch
+    torch.set_num_threads(threads_per_worker)
+    import cv2
+    cv2.setNumThreads(1)
+
+    from ultralytics import YOLO
+    _model = YOLO(model_path)
+    _options = options
+
+
+def _process_video(path):
+    t0 = time.perf_counter()
+    class_counts = Counter()
+    frames = 0
+    max_per_frame = 0
+
+    results = _model.predict(source=path, stream=True, verbose=False,
+                             conf=_options["conf"], imgsz=_options["imgsz"],
+                             device="cpu", save=_options["save"])
+    for result in results:
+        frames += 1
+        if result.boxes is None or len(result.boxes) == 0:
+            continue
+        cls = result.boxes.cls.cpu().numpy().astype(int)
+        max_per_frame = max(max_per_frame, len(cls))
+        for c in cls:
+            class_counts[_model.names[int(c)]] += 1
+
+    elapsed = time.perf_counter() - t0
+    return {
+        "video": path,
+        "frames": frames,
+        "seconds": round(elapsed, 3),
+        "fps": round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        "detections": sum(class_counts.values()),
+        "max_detections_per_frame": max_per_frame,
+        "class_counts": dict(class_counts),
+        "worker_pid": os.getpid(),
+    }
+
+
+def find_videos(directory):
+    paths = []
+    for ext in VIDEO_EXTENSIONS:
+        paths.extend(glob.glob(os.path.join(directory, "**", f"*{ext}"), recursive=True))
+    return sorted(set(paths))
+
+
+def _already_done(manifest_path):
+    done = set()
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if "error" not in record:
+                    done.add(record["video"])
+    return done
+
+
+def run_batch(directory, manifest_path, model_path="yolov8n.pt", workers=None,
+              conf=0.25, imgsz=320, save=False):
+    workers = workers or os.cpu_count() or 1
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    options = {"conf": conf, "imgsz": imgsz, "save": save}
+
+    done = _already_done(manifest_path)
+    videos = [v for v in find_videos(directory) if v not in done]
+    print(f"{len(videos)} videos to process ({len(done)} already in manifest), {workers} workers")
+    if not videos:
+        return
+
+    t0 = time.perf_counter()
+    total_frames = 0
+    with open(manifest_path, "a") as manifest, ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(model_path, options, threads_per_worker)) as pool:
+        futures = {pool.submit(_process_video, v): v for v in videos}
+        for n, future in enumerate(as_completed(futures), 1):
+            try:
+                record = future.result()
+                total_frames += record["frames"]
+            except Exception as e:
+                record = {"video": futures[future], "error": repr(e)}
+            manifest.write(json.dumps(record) + "\n")
+            manifest.flush()
+            status = "error" if "error" in record else f"{record['frames']} frames in {record['seconds']}s"
+            print(f"[{n}/{len(videos)}] {os.path.basename(record['video'])}: {status}")
+
+    elapsed = time.perf_counter() - t0
+    print(f"Done: {total_frames} frames in {elapsed:.1f}s "
+          f"({total_frames / elapsed if elapsed else 0:.1f} frames/s aggregate)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory")
+    parser.add_argument("--manifest", default="manifest.jsonl")
+    parser.add_argument("--model", default="yolov8n.pt")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU core")
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--imgsz", type=int, default=320)
+    parser.add_argument("--save", action="store_true", help="also write annotated videos under runs/detect")
+    args = parser.parse_args()
+
+    run_batch(args.directory, args.manifest, args.model, args.workers, args.conf, args.imgsz, args.save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Structured detection store: per-frame detections as Parquet or JSONL.
+
+The Colab cells keep only the annotated MP4 under ``runs/detect/predict*``,
+so any later analysis has to run detection again. ``DetectionSink`` instead
+streams one row per box to disk::
+
+    frame, timestamp, class_id, class, conf, x1, y1, x2, y2
+
+Rows are buffered and written in chunks (``part-00000.parquet`` or
+``part-00000.jsonl``). For each chunk, ``index.json`` records the time range
+and the frames that contain each class. ``query`` uses that index to read
+only the chunks it needs, and never touches the video.
+
+Parquet is used when pyarrow is installed; otherwise it falls back to JSONL.
+
+Usage:
+    python detection_store.py record video.mp4 store/
+    python detection_store.py query store/ person --start 10 --end 20
+"""
+
+import argparse
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+COLUMNS = ["frame", "timestamp", "class_id", "class", "conf", "x1", "y1", "x2", "y2"]
+
+
+class DetectionSink:
+    def __init__(self, directory, names, fmt=None, chunk_rows=50000):
+        if fmt is None:
+            fmt = "parquet" if pa is not None else "jsonl"
+        if fmt == "parquet" and pa is None:
+            raise ImportError("pyarrow is required for the parquet format")
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.names = names
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self._buffer = {c: [] for c in COLUMNS}
+        self._chunk_classes = {}
+        self._chunk_t = None
+        self._index = {"format": fmt, "columns": COLUMNS, "chunks": []}
+
+    def add(self, frame_index, timestamp, detections):
+        """Append one frame's (N, 6) xyxy/conf/cls detections."""
+        buf = self._buffer
+        for x1, y1, x2, y2, conf, cls in detections.tolist():
+            cls = int(cls)
+            name = self.names[cls]
+            buf["frame"].append(frame_index)
+            buf["timestamp"].append(round(timestamp, 4))
+            buf["class_id"].append(cls)
+            buf["class"].append(name)
+            buf["conf"].append(round(conf, 4))
+            buf["x1"].append(round(x1, 1))
+            buf["y1"].append(round(y1, 1))
+            buf["x2"].append(round(x2, 1))
+            buf["y2"].append(round(y2, 1))
+
+            frames = self._chunk_classes.setdefault(name, [])
+            if not frames or frames[-1] != frame_index:
+                frames.append(frame_index)
+
+        if len(detections):
+            if self._chunk_t is None:
+                self._chunk_t = [timestamp, timestamp]
+            self._chunk_t[1] = timestamp
+        if len(buf["frame"]) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        rows = len(self._buffer["frame"])
+        if rows == 0:
+            return
+        part = f"part-{len(self._index['chunks']):05d}.{self.fmt}"
+        path = os.path.join(self.directory, part)
+
+        if self.fmt == "parquet":
+            pq.write_table(pa.table(self._buffer), path)
+        else:
+            with open(path, "w") as f:
+                for values in zip(*(self._buffer[c] for c in COLUMNS)):
+                    f.write(json.dumps(dict(zip(COLUMNS, values))) + "\n")
+
+        self._index["chunks"].append({
+            "file": part,
+            "rows": rows,
+            "t_min": self._chunk_t[0],
+            "t_max": self._chunk_t[1],
+            "class_frames": self._chunk_classes,
+        })
+        self._buffer = {c: [] for c in COLUMNS}
+        self._chunk_classes = {}
+        self._chunk_t = None
+        self._write_index()
+
+    def _write_index(self):
+        tmp = os.path.join(self.directory, "index.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, os.path.join(self.directory, "index.json"))
+
+    def close(self):
+        self.flush()
+        self._write_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_chunk(directory, chunk, fmt):
+    path = os.path.join(directory, chunk["file"])
+    if fmt == "parquet":
+        table = pq.read_table(path)
+        cols = table.to_pydict()
+        return [dict(zip(COLUMNS, values)) for values in zip(*(cols[c] for c in COLUMNS))]
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def query(directory, class_name, start_time=None, end_time=None):
+    """Return {frame_index: [row, ...]} for frames containing ``class_name``.
+
+    Chunks whose time range does not overlap the window, or that do not
+    contain the class, are skipped using the index alone.
+    """
+    with open(os.path.join(directory, "index.json")) as f:
+        index = json.load(f)
+
+    frames = {}
+    for chunk in index["chunks"]:
+        if class_name not in chunk["class_frames"]:
+            continue
+        if start_time is not None and chunk["t_max"] < start_time:
+            continue
+        if end_time is not None and chunk["t_min"] > end_time:
+            continue
+        for row in _read_chunk(directory, chunk, index["format"]):
+            if row["class"] != class_name:
+                continue
+            if start_time is not None and row["timestamp"] < start_time:
+                continue
+            if end_time is not None and row["timestamp"] > end_time:
+                continue
+            frames.setdefault(row["frame"], []).append(row)
+    return frames
+
+
+def record_video(model, path, directory, fmt=None, imgsz=320, conf=0.25):
+    """Run detection over ``path`` and stream every box into a store."""
+    from detections import result_to_array
+    from video_io import video_info
+
+    fps, _, _ = video_info(path)
+    fps = fps or 30.0
+    results = model.predict(source=path, stream=True, imgsz=imgsz, conf=conf,
+                            device="cpu", verbose=False)
+    with DetectionSink(directory, model.names, fmt=fmt) as sink:
+        for frame_index, result in enumerate(results):
+            sink.add(frame_index, frame_index / fps, result_to_array(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="detect objects in a video and store them")
+    rec.add_argument("video")
+    rec.add_argument("store")
+    rec.add_argument("--model", default="yolov8n.pt")
+    rec.add_argument("--format", choices=["parquet", "jsonl"], default=None)
+    rec.add_argument("--imgsz", type=int, default=320)
+
+    q = sub.add_parser("query", help="list frames containing a class")
+    q.add_argument("store")
+    q.add_argument("class_name")
+    q.add_argument("--start", type=float, default=None)
+    q.add_argument("--end", type=float, default=None)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        from ultralytics import YOLO
+        record_video(YOLO(args.model), args.video, args.store, fmt=args.format, imgsz=args.imgsz)
+        print(f"Detections stored in {args.store}")
+    else:
+        frames = query(args.store, args.class_name, args.start, args.end)
+        for frame_index in sorted(frames):
+            rows = frames[frame_index]
+            print(f"frame {frame_index} @ {rows[0]['timestamp']:.2f}s: {len(rows)} x {args.class_name}")
+        print(f"{len(frames)} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Small NumPy helpers for YOLO detections.
+
+Detections are passed around as float32 arrays of shape (N, 6) with columns
+``x1, y1, x2, y2, conf, cls`` -- the same layout as ``results.boxes.data``.
+"""
+
+import numpy as np
+
+EMPTY = np.zeros((0, 6), dtype=np.float32)
+
+
+def result_to_array(result):
+    """Copy an Ultralytics result's boxes to the host in one transfer."""
+    if result.boxes is None or len(result.boxes) == 0:
+        return EMPTY
+    return result.boxes.data.cpu().numpy().astype(np.float32)[:, :6]
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU between (N, 4+) and (M, 4+) xyxy box arrays."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return inter / np.maximum(union, 1e-9)
+
+
+def greedy_match(iou, threshold):
+    """Greedy one-to-one matching on an IoU matrix.
+
+    Returns a list of (row, col) pairs with IoU >= threshold, best first.
+    """
+    pairs = []
+    if iou.size == 0:
+        return pairs
+    iou = iou.copy()
+    while True:
+        r, c = np.unravel_index(np.argmax(iou), iou.shape)
+        if iou[r, c] < threshold:
+            break
+        pairs.append((int(r), int(c)))
+        iou[r, :] = -1
+        iou[:, c] = -1
+    return pairs
+
+
+def match_rate(reference, candidate, iou_threshold=0.5):
+    """Return (recall, precision) of ``candidate`` against ``reference``.
+
+    A candidate box counts as correct when it overlaps an unmatched reference
+    box of the same class with IoU >= ``iou_threshold``.
+    """
+    if len(reference) == 0 and len(candidate) == 0:
+        return 1.0, 1.0
+    iou = iou_matrix(reference, candidate)
+    same_class = reference[:, None, 5] == candidate[None, :, 5]
+    matched = len(greedy_match(np.where(same_class, iou, 0.0), iou_threshold))
+    recall = matched / len(reference) if len(reference) else 1.0
+    precision = matched / len(candidate) if len(candidate) else 1.0
+    return recall, precision
@@ -48,18 +48,21 @@ else:
     start_time = 10
     end_time = 20
 
+    # Stream copy (no re-encode) via video_io.py -- upload it next to this notebook.
+    # The cut starts at the keyframe at or before start_time.
+    from video_io import clamp_window, extract_subclip, video_info
+
     print("Extracting subclip from 10s to 20s (or shorter if video is shorter)...")
-    with VideoFileClip(video_filename) as clip:
-        if end_time > clip.duration:
-            end_time = clip.duration
-        if start_time >= end_time:
-            print("Invalid subclip times. Using full video instead.")
-            subclip_filename = video_filename
-        else:
-            subclip = clip.subclip(start_time, end_time)
-            subclip_filename = f"subclip_{video_filename}"
-            subclip.write_videofile(subclip_filename, codec="libx264", audio_codec="aac", logger=None)
-            print(f"Subclip saved as {subclip_filename}")
+    _, _, duration = video_info(video_filename)
+    window = clamp_window(start_time, end_time, duration)
+    if window is None:
+        print("Invalid subclip times. Using full video instead.")
+        subclip_filename = video_filename
+    else:
+        start_time, end_time = window
+        subclip_filename = extract_subclip(video_filename, start_time, end_time,
+                                           f"subclip_{video_filename}")
+        print(f"Subclip saved as {subclip_filename}")
 
     # Step: Run YOLO detection on subclip
     print("Running YOLOv8 object detection on subclip...")
@@ -121,8 +124,6 @@ import os
 import cv2
 import glob
 import shutil
-from transformers import BlipProcessor, BlipForConditionalGeneration
-from PIL import Image
 
 # Step 1: Upload Button
 print("📤 Please upload your video file")
@@ -158,25 +159,17 @@ else:
     print("\n💾 Downloading processed video to your local machine...")
     files.download(detected_video_path) # This line is added for automatic download
 
-    # Step 7: BLIP Captioning
-    print("📝 Generating caption with BLIP...")
-    processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-    model_blip = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
-
-    # Capture first frame
-    cap = cv2.VideoCapture(detected_video_path)
-    success, frame = cap.read()
-    cap.release()
-    if success:
-        img_path = "temp_first_frame.jpg"
-        cv2.imwrite(img_path, frame)
-        raw_image = Image.open(img_path).convert('RGB')
-        inputs = processor(raw_image, return_tensors="pt")
-        out = model_blip.generate(**inputs)
-        caption = processor.decode(out[0], skip_special_tokens=True)
-        print(f"🗣️ Caption: {caption}")
+    # Step 7: BLIP Captioning (one caption per detected scene, see video_captioning.py)
+    # Upload both video_captioning.py and video_io.py (which it imports) next to this notebook.
+    from video_captioning import caption_video
+
+    print("📝 Generating captions with BLIP...")
+    caption_track = caption_video(video_path)
+    if caption_track:
+        for start, end, caption in caption_track:
+            print(f"🗣️ [{start:.1f}s - {end:.1f}s] {caption}")
     else:
-        print("❌ Could not extract frame for captioning.")
+        print("❌ Could not extract frames for captioning.")
 
 # Step 8: Upload Button at End
 print("\n⬇️ Click to re-upload another video anytime:")
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""Frame-skipping / adaptive-stride detection for long videos.
+
+Running YOLO on every frame of hour-long footage wastes most of the time on
+near-identical frames. ``AdaptiveDetector`` runs the detector only:
+
+* every ``every_n`` frames, or
+* as soon as a cheap scene-change score (mean absolute difference of small
+  grayscale thumbnails) goes above ``diff_threshold``.
+
+On the frames in between, the last boxes are moved with sparse Lucas-Kanade
+optical flow. Each box is shifted by the median motion of the corner points
+inside it.
+
+Usage:
+    python stride_detection.py video.mp4 --every-n 5 --diff-threshold 12 --compare
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from detections import EMPTY, match_rate, result_to_array
+from video_io import iter_frames
+
+THUMB_SIZE = (64, 36)
+
+
+def scene_change_score(prev_thumb, thumb):
+    """Mean absolute grey-level difference between two thumbnails (0-255)."""
+    if prev_thumb is None:
+        return float("inf")
+    return float(cv2.absdiff(prev_thumb, thumb).mean())
+
+
+class AdaptiveDetector:
+    def __init__(self, model, every_n=5, diff_threshold=12.0, imgsz=320, conf=0.25, device="cpu"):
+        self.model = model
+        self.every_n = max(1, int(every_n))
+        self.diff_threshold = diff_threshold
+        self.imgsz = imgsz
+        self.conf = conf
+        self.device = device
+
+        self._since_detect = None
+        self._last_thumb = None
+        self._prev_gray = None
+        self._boxes = EMPTY
+        self.detector_calls = 0
+
+    def _detect(self, frame):
+        self.detector_calls += 1
+        result = self.model.predict(source=frame, conf=self.conf, imgsz=self.imgsz,
+                                    device=self.device, verbose=False)[0]
+        return result_to_array(result)
+
+    def _propagate(self, gray):
+        if len(self._boxes) == 0 or self._prev_gray is None:
+            return self._boxes
+        boxes = self._boxes.copy()
+        h, w = gray.shape
+        for box in boxes:
+            x1, y1, x2, y2 = np.clip(box[:4], 0, [w - 1, h - 1, w - 1, h - 1]).astype(int)
+            if x2 - x1 < 4 or y2 - y1 < 4:
+                continue
+            pts = cv2.goodFeaturesToTrack(self._prev_gray[y1:y2, x1:x2], 20, 0.01, 3)
+            if pts is None:
+                continue
+            pts = pts + np.array([x1, y1], dtype=np.float32)
+            nxt, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, pts, None)
+            good = status.ravel() == 1
+            if not good.any():
+                continue
+            dx, dy = np.median((nxt - pts)[good].reshape(-1, 2), axis=0)
+            box[[0, 2]] += dx
+            box[[1, 3]] += dy
+        return boxes
+
+    def process(self, frame):
+        """Return (detections, ran_detector) for the next frame in sequence."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        thumb = cv2.resize(gray, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+
+        due = self._since_detect is None or self._since_detect + 1 >= self.every_n
+        changed = scene_change_score(self._last_thumb, thumb) > self.diff_threshold
+
+        if due or changed:
+            self._boxes = self._detect(frame)
+            self._last_thumb = thumb
+            self._since_detect = 0
+            ran = True
+        else:
+            self._boxes = self._propagate(gray)
+            self._since_detect += 1
+            ran = False
+
+        self._prev_gray = gray
+        return self._boxes, ran
+
+
+def run(model, path, start_time=0.0, end_time=None, **kwargs):
+    """Run adaptive detection over a video.
+
+    Returns (list of (frame_index, timestamp, detections), stats dict).
+    """
+    detector = AdaptiveDetector(model, **kwargs)
+    out = []
+    t0 = time.perf_counter()
+    for idx, ts, frame in iter_frames(path, start_time, end_time):
+        boxes, _ = detector.process(frame)
+        out.append((idx, ts, boxes))
+    elapsed = time.perf_counter() - t0
+    stats = {
+        "frames": len(out),
+        "detector_calls": detector.detector_calls,
+        "seconds": elapsed,
+        "fps": len(out) / elapsed if elapsed > 0 else 0.0,
+    }
+    return out, stats
+
+
+def compare_with_full(model, path, start_time=0.0, end_time=None, **kwargs):
+    """Run full per-frame detection and adaptive mode, and report speed and agreement."""
+    full_kwargs = dict(kwargs, every_n=1)
+    full, full_stats = run(model, path, start_time, end_time, **full_kwargs)
+    fast, fast_stats = run(model, path, start_time, end_time, **kwargs)
+
+    recalls, precisions = [], []
+    for (_, _, ref), (_, _, cand) in zip(full, fast):
+        r, p = match_rate(ref, cand)
+        recalls.append(r)
+        precisions.append(p)
+
+    return {
+        "full": full_stats,
+        "adaptive": fast_stats,
+        "speedup": fast_stats["fps"] / full_stats["fps"] if full_stats["fps"] else 0.0,
+        "mean_recall_vs_full": float(np.mean(recalls)) if recalls else 0.0,
+        "mean_precision_vs_full": float(np.mean(precisions)) if precisions else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--model", default="yolov8n.pt")
+    parser.add_argument("--every-n", type=int, default=5)
+    parser.add_argument("--diff-threshold", type=float, default=12.0)
+    parser.add_argument("--imgsz", type=int, default=320)
+    parser.add_argument("--start", type=float, default=0.0)
+    parser.add_argument("--end", type=float, default=None)
+    parser.add_argument("--compare", action="store_true",
+                        help="also run full per-frame inference and report agreement")
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+    model = YOLO(args.model)
+    kwargs = dict(every_n=args.every_n, diff_threshold=args.diff_threshold, imgsz=args.imgsz)
+
+    if args.compare:
+        report = compare_with_full(model, args.video, args.start, args.end, **kwargs)
+        for mode in ("full", "adaptive"):
+            s = report[mode]
+            print(f"{mode:>8}: {s['frames']} frames, {s['detector_calls']} detector calls, {s['fps']:.1f} fps")
+        print(f"speedup: {report['speedup']:.2f}x")
+        print(f"recall vs full: {report['mean_recall_vs_full']:.3f}  "
+              f"precision vs full: {report['mean_precision_vs_full']:.3f}")
+    else:
+        _, stats = run(model, args.video, args.start, args.end, **kwargs)
+        print(f"{stats['frames']} frames, {stats['detector_calls']} detector calls, {stats['fps']:.1f} fps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""SORT-style multi-object tracking on top of YOLO detections.
+
+Each track has a constant-velocity Kalman filter over (cx, cy, w, h), written
+in plain NumPy. New detections are matched to the predicted track boxes by
+greedy IoU. Tracks keep a stable integer ID for as long as they keep matching.
+
+Memory stays bounded on long streams:
+
+* a track that has not matched for ``max_age`` frames is closed, turned into
+  a compact record, and removed from the tracker;
+* each trajectory is capped at ``max_points`` samples. When it fills up,
+  every other point is dropped, which keeps the overall shape of the path.
+
+Usage:
+    python tracking.py video.mp4 --out tracks.jsonl
+"""
+
+import argparse
+import json
+from collections import Counter
+
+import numpy as np
+
+from detections import greedy_match, iou_matrix, result_to_array
+
+# Constant-velocity model: state = [cx, cy, w, h, vcx, vcy, vw, vh].
+_F = np.eye(8, dtype=np.float64)
+_F[:4, 4:] = np.eye(4)
+_H = np.eye(4, 8, dtype=np.float64)
+
+
+def _xyxy_to_z(box):
+    x1, y1, x2, y2 = box[:4]
+    return np.array([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1], dtype=np.float64)
+
+
+def _x_to_xyxy(x):
+    cx, cy, w, h = x[:4]
+    return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], dtype=np.float32)
+
+
+class Track:
+    def __init__(self, track_id, det, frame_index, max_points):
+        self.id = track_id
+        self.x = np.zeros(8)
+        self.x[:4] = _xyxy_to_z(det)
+        self.P = np.diag([10.0, 10.0, 10.0, 10.0, 1e3, 1e3, 1e3, 1e3])
+        self.Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 0.01, 0.01])
+        self.R = np.diag([1.0, 1.0, 10.0, 10.0])
+
+        self.first_frame = frame_index
+        self.last_frame = frame_index
+        self.hits = 1
+        self.misses = 0
+        self.class_votes = Counter({int(det[5]): 1})
+        self.conf_sum = float(det[4])
+        self.max_points = max_points
+        self.stride = 1
+        self.trajectory = [(frame_index, *np.round(det[:4], 1).tolist())]
+
+    def predict(self):
+        # Do not let the width or height go negative.
+        if self.x[2] + self.x[6] <= 0:
+            self.x[6] = 0
+        if self.x[3] + self.x[7] <= 0:
+            self.x[7] = 0
+        self.x = _F @ self.x
+        self.P = _F @ self.P @ _F.T + self.Q
+        return _x_to_xyxy(self.x)
+
+    def update(self, det, frame_index):
+        z = _xyxy_to_z(det)
+        y = z - _H @ self.x
+        S = _H @ self.P @ _H.T + self.R
+        K = self.P @ _H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = (np.eye(8) - K @ _H) @ self.P
+
+        self.last_frame = frame_index
+        self.hits += 1
+        self.misses = 0
+        self.class_votes[int(det[5])] += 1
+        self.conf_sum += float(det[4])
+        if frame_index - self.trajectory[-1][0] >= self.stride:
+            self.trajectory.append((frame_index, *np.round(det[:4], 1).tolist()))
+            if len(self.trajectory) > self.max_points:
+                self.trajectory = self.trajectory[::2]
+                self.stride *= 2
+
+    def record(self, names=None):
+        cls = self.class_votes.most_common(1)[0][0]
+        return {
+            "track_id": self.id,
+            "class_id": cls,
+            "class": names[cls] if names else str(cls),
+            "first_frame": self.first_frame,
+            "last_frame": self.last_frame,
+            "hits": self.hits,
+            "mean_conf": round(self.conf_sum / self.hits, 4),
+            "trajectory": self.trajectory,
+        }
+
+
+class Tracker:
+    def __init__(self, iou_threshold=0.3, max_age=30, min_hits=3, max_points=64, names=None):
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.max_points = max_points
+        self.names = names
+        self.tracks = []
+        self._next_id = 1
+
+    def update(self, detections, frame_index):
+        """Advance by one frame.
+
+        ``detections`` is an (N, 6) xyxy/conf/cls array. Returns
+        (active, finished): ``active`` is a list of (track_id, xyxy, class_id)
+        for confirmed tracks seen in this frame, and ``finished`` holds the
+        records of tracks closed in this frame.
+        """
+        predicted = np.array([t.predict() for t in self.tracks], dtype=np.float32).reshape(-1, 4)
+
+        iou = iou_matrix(predicted, detections)
+        if iou.size:
+            # Only associate boxes of the same class.
+            same_class = np.array([[t.class_votes.most_common(1)[0][0] for t in self.tracks]]).T \
+                == detections[None, :, 5].astype(int)
+            iou = np.where(same_class, iou, 0.0)
+        pairs = greedy_match(iou, self.iou_threshold)
+
+        matched_tracks = set()
+        matched_dets = set()
+        for ti, di in pairs:
+            self.tracks[ti].update(detections[di], frame_index)
+            matched_tracks.add(ti)
+            matched_dets.add(di)
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.misses += 1
+
+        for di in range(len(detections)):
+            if di not in matched_dets:
+                self.tracks.append(Track(self._next_id, detections[di], frame_index, self.max_points))
+                self._next_id += 1
+
+        finished = []
+        alive = []
+        for track in self.tracks:
+            if track.misses > self.max_age:
+                if track.hits >= self.min_hits:
+                    finished.append(track.record(self.names))
+            else:
+                alive.append(track)
+        self.tracks = alive
+
+        active = [(t.id, _x_to_xyxy(t.x), t.class_votes.most_common(1)[0][0])
+                  for t in self.tracks if t.misses == 0 and t.hits >= self.min_hits]
+        return active, finished
+
+    def flush(self):
+        """Close all remaining tracks and return their records."""
+        records = [t.record(self.names) for t in self.tracks if t.hits >= self.min_hits]
+        self.tracks = []
+        return records
+
+
+def track_video(model, path, out_path, imgsz=320, conf=0.25, **tracker_kwargs):
+    """Detect and track every frame of ``path``; write one JSON line per track.
+
+    Returns the number of distinct tracks per class name.
+    """
+    tracker = Tracker(names=model.names, **tracker_kwargs)
+    counts = Counter()
+    with open(out_path, "w") as out:
+        def emit(records):
+            for r in records:
+                counts[r["class"]] += 1
+                out.write(json.dumps(r) + "\n")
+
+        results = model.predict(source=path, stream=True, imgsz=imgsz, conf=conf,
+                                device="cpu", verbose=False)
+        for frame_index, result in enumerate(results):
+            _, finished = tracker.update(result_to_array(result), frame_index)
+            emit(finished)
+        emit(tracker.flush())
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--out", default="tracks.jsonl")
+    parser.add_argument("--model", default="yolov8n.pt")
+    parser.add_argument("--imgsz", type=int, default=320)
+    parser.add_argument("--max-age", type=int, default=30)
+    parser.add_argument("--min-hits", type=int, default=3)
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+    model = YOLO(args.model)
+    counts = track_video(model, args.video, args.out, imgsz=args.imgsz,
+                         max_age=args.max_age, min_hits=args.min_hits)
+    print(f"Tracks written to {args.out}")
+    for name, n in counts.most_common():
+        print(f"  {name}: {n} distinct")
+
+
+if __name__ == "__main__":
+    main()
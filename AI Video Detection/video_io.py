@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Video input helpers shared by the detection cells.
+
+Cutting the 10s-20s window with moviepy's ``subclip().write_videofile()``
+decodes and re-encodes every frame of the window before YOLO even starts.
+The helpers here avoid that work:
+
+* ``iter_frames`` seeks the demuxer straight to ``start_time`` and yields only
+  the frames inside the window, so they can be fed to the detector directly.
+* ``extract_subclip`` writes a file with an ffmpeg stream copy (no decode, no
+  encode). The cut snaps to the keyframe at or before ``start_time``.
+"""
+
+import os
+import shutil
+import subprocess
+
+import cv2
+
+
+def _ffmpeg_binary():
+    # moviepy ships its own ffmpeg through imageio-ffmpeg; prefer it so the
+    # Colab runtime does not need a system install.
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which("ffmpeg")
+
+
+def video_info(path):
+    """Return (fps, frame_count, duration_seconds) read from the container."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    cap.release()
+    duration = frame_count / fps if fps > 0 else 0.0
+    return fps, frame_count, duration
+
+
+def clamp_window(start_time, end_time, duration):
+    """Clamp a [start, end) window to the video length.
+
+    Returns None when the window is empty, mirroring the old
+    "Invalid subclip times. Using full video instead." branch.
+    """
+    if end_time is None or end_time > duration:
+        end_time = duration
+    start_time = max(0.0, start_time or 0.0)
+    if start_time >= end_time:
+        return None
+    return start_time, end_time
+
+
+def iter_frames(path, start_time=0.0, end_time=None, stride=1):
+    """Yield (frame_index, timestamp_seconds, frame) for frames in the window.
+
+    The capture is positioned with a single seek instead of decoding from the
+    start, and reading stops at ``end_time``. ``frame_index`` is the absolute
+    index in the source video so results line up with the original file.
+    With ``stride > 1`` only every ``stride``-th frame is returned; the
+    others are still decoded, just not converted.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    if start_time:
+        cap.set(cv2.CAP_PROP_POS_MSEC, start_time * 1000.0)
+    frame_index = int(round(cap.get(cv2.CAP_PROP_POS_FRAMES)))
+
+    try:
+        while True:
+            if end_time is not None and frame_index / fps >= end_time:
+                break
+            if stride > 1 and frame_index % stride:
+                # grab() still decodes the frame (the FFmpeg backend has to,
+                # for inter-frame codecs); it only skips retrieve()'s copy and
+                # colour conversion, so skipped frames are cheaper, not free.
+                if not cap.grab():
+                    break
+                frame_index += 1
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame_index, frame_index / fps, frame
+            frame_index += 1
+    finally:
+        cap.release()
+
+
+def extract_subclip(path, start_time, end_time, output_path=None):
+    """Write [start_time, end_time) to a new file without re-encoding.
+
+    Uses ``ffmpeg -ss ... -c copy``, so the runtime depends on the container
+    size, not the clip length. Audio is copied as is. Because it is a stream
+    copy, the cut begins at the keyframe at or before ``start_time``.
+    Returns the output path.
+    """
+    ffmpeg = _ffmpeg_binary()
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg not found; install imageio-ffmpeg or ffmpeg")
+
+    if output_path is None:
+        output_path = f"subclip_{os.path.basename(path)}"
+
+    cmd = [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-ss", f"{start_time:.3f}",
+        "-i", path,
+        "-t", f"{end_time - start_time:.3f}",
+        "-c", "copy",
+        "-avoid_negative_ts", "make_zero",
+        output_path,
+    ]
+    subprocess.run(cmd, check=True)
+    return output_path
@@ -0,0 +1,220 @@
+"""Headless benchmark harness for the webcam-based scripts.
+
+The real-time scripts read from ``VideoCapture(0)`` and show results with
+``imshow``, so they cannot run on CI or render hosts that have no camera or
+display. Each of them exposes ``process_frame(frame, stage)``. The harness
+imports the script, feeds it a recorded video or synthetic frames, and times
+every ``with stage(name):`` block. No window is ever opened.
+
+Reported per detector: per-stage and per-frame latency (mean/p50/p95/max),
+FPS, CPU utilisation (process CPU time / wall time, so it can exceed 100% with
+several threads) and peak RSS, plus the script's ``BENCHMARK_CONFIG`` (e.g.
+the fixed ``imgsz``) if it defines one. Results are written to a JSON file.
+
+Usage:
+    python benchmarks/headless_harness.py face --video clip.mp4 --frames 300
+    python benchmarks/headless_harness.py all --synthetic 1280x720 --out results.json
+
+With ``all``, each detector runs in its own subprocess, so peak memory is
+not shared between them.
+"""
+
+import argparse
+import collections
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DETECTORS = {
+    "realtime": ("AI Real Time Detection", "Real Time using webcam.py"),
+    "face": ("AI Face Detection", "face_dectection code.py"),
+    "age": ("AI Age Detection", "Age_detection_model.py"),
+    "emotion": ("AI Play Music with Emotions", "inference.py"),
+}
+
+
+def load_detector(name):
+    """Import a detector script by path.
+
+    The working directory is changed to the script's folder, because the
+    scripts load their model files by relative path and import their
+    sibling modules.
+    """
+    folder, filename = DETECTORS[name]
+    directory = os.path.join(ROOT, folder)
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(f"detector_{name}", os.path.join(directory, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def video_frames(path, count):
+    """Yield ``count`` frames from ``path``, rewinding at the end."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {path}")
+    produced = 0
+    while produced < count:
+        ret, frame = cap.read()
+        if not ret:
+            if produced == 0:
+                raise IOError(f"No frames in video: {path}")
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            continue
+        produced += 1
+        yield frame
+    cap.release()
+
+
+def synthetic_frames(width, height, count, seed=0):
+    """Yield deterministic frames: a noisy background with moving shapes."""
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    background = cv2.GaussianBlur(background, (0, 0), 8)
+    for i in range(count):
+        frame = background.copy()
+        for k in range(5):
+            cx = int((width / 2) + (width / 3) * np.sin(i / 30 + k))
+            cy = int((height / 2) + (height / 3) * np.cos(i / 45 + k))
+            cv2.circle(frame, (cx, cy), height // 10, (40 * k, 200, 255 - 40 * k), -1)
+        yield frame
+
+
+def _summary(values_s):
+    ms = sorted(v * 1000 for v in values_s)
+    if not ms:
+        return {}
+    return {
+        "count": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(ms[len(ms) // 2], 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run(name, frames, warmup=10):
+    module = load_detector(name)
+    timings = collections.defaultdict(list)
+    recording = False
+
+    @contextlib.contextmanager
+    def stage(stage_name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if recording:
+                timings[stage_name].append(time.perf_counter() - start)
+
+    frame_times = []
+    cpu_start = wall_start = None
+    for i, frame in enumerate(frames):
+        if i == warmup:
+            recording = True
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+        start = time.perf_counter()
+        module.process_frame(frame, stage)
+        if recording:
+            frame_times.append(time.perf_counter() - start)
+
+    if not recording:
+        raise ValueError(f"Need more than {warmup} frames (the warmup count)")
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return {
+        "detector": name,
+        "config": getattr(module, "BENCHMARK_CONFIG", {}),
+        "frames": len(frame_times),
+        "warmup_frames": warmup,
+        "fps": round(len(frame_times) / wall, 2) if wall > 0 else 0.0,
+        "cpu_percent": round(100 * cpu / wall, 1) if wall > 0 else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "frame": _summary(frame_times),
+        "stages": {k: _summary(v) for k, v in timings.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("detector", choices=sorted(DETECTORS) + ["all"])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--video", help="recorded video to feed (looped as needed)")
+    source.add_argument("--synthetic", default="1280x720", help="WxH of synthetic frames (default)")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--out", default="headless_results.json")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out_path = os.path.abspath(args.out)
+    total = args.frames + args.warmup
+
+    if args.detector == "all":
+        results = []
+        for name in sorted(DETECTORS):
+            part = f"{out_path}.{name}.tmp"
+            cmd = [sys.executable, os.path.abspath(__file__), name, "--frames", str(args.frames),
+                   "--warmup", str(args.warmup), "--out", part]
+            cmd += ["--video", os.path.abspath(args.video)] if args.video else ["--synthetic", args.synthetic]
+            proc = subprocess.run(cmd)
+            if proc.returncode == 0:
+                with open(part) as f:
+                    results.extend(json.load(f)["results"])
+                os.remove(part)
+            else:
+                results.append({"detector": name, "error": f"exit code {proc.returncode}"})
+    else:
+        if args.video:
+            frames = video_frames(os.path.abspath(args.video), total)
+        else:
+            width, height = (int(v) for v in args.synthetic.lower().split("x"))
+            frames = synthetic_frames(width, height, total)
+        results = [run(args.detector, frames, args.warmup)]
+
+    report = {
+        "source": args.video or f"synthetic:{args.synthetic}",
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "opencv": cv2.__version__,
+        },
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for r in results:
+        if "error" in r:
+            print(f"{r['detector']:>9}: {r['error']}")
+        else:
+            print(f"{r['detector']:>9}: {r['fps']:.1f} fps, {r['frame']['mean_ms']:.1f} ms/frame, "
+                  f"CPU {r['cpu_percent']:.0f}%, peak RSS {r['peak_rss_mb']} MB")
+    print(f"Results written to {out_path}")
+
+
+if __name__ == "__main__":
+    main()